@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Static asset helpers for the dashboards
+Reads the assets/manifest.json written by build_assets.py and renders the
+self-hosted font tags and responsive <picture> elements. Without a manifest
+the pages fall back to Google Fonts and the original images.
+"""
+
+import json
+from html import escape
+from pathlib import Path
+from typing import Dict, Union
+
+ASSETS_DIR = "assets"
+MANIFEST_FILE = "manifest.json"
+
+GOOGLE_FONTS_LINK = '<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600&display=swap" rel="stylesheet">'
+
+
+def load_manifest(output_dir: Union[str, Path] = ".") -> Dict:
+    """Load the asset manifest for pages published in ``output_dir`` ({} if not built)"""
+    try:
+        with open(Path(output_dir) / ASSETS_DIR / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def font_head_html(manifest: Dict) -> str:
+    """Return the <head> markup that loads Poppins
+
+    With a built manifest the subset WOFF2 files are preloaded and declared
+    with ``font-display: swap``, so text renders immediately with a fallback
+    font instead of waiting on a third-party stylesheet.
+    """
+    fonts = manifest.get("fonts")
+    if not fonts:
+        return GOOGLE_FONTS_LINK
+
+    tags = []
+    if "400" in fonts:
+        tags.append(f'<link rel="preload" href="{escape(fonts["400"])}" as="font" type="font/woff2" crossorigin>')
+    faces = "".join(
+        f"@font-face{{font-family:'Poppins';font-style:normal;font-weight:{weight};"
+        f"font-display:swap;src:url('{escape(url)}') format('woff2');}}"
+        for weight, url in sorted(fonts.items())
+    )
+    tags.append(f"<style>{faces}</style>")
+    return "\n    ".join(tags)
+
+
+def picture_html(manifest: Dict, name: str, alt: str, sizes: str, **attributes: str) -> str:
+    """Return a responsive <picture> for an image built by build_assets.py
+
+    Falls back to a plain <img> of the original file if the image has not
+    been built. Extra keyword arguments become <img> attributes (``class_``
+    is written as ``class``).
+    """
+    attrs = "".join(f' {key.rstrip("_")}="{escape(value)}"' for key, value in attributes.items())
+    image = manifest.get("images", {}).get(name)
+    if not image:
+        return f'<img src="./{escape(name)}" alt="{escape(alt)}"{attrs}>'
+
+    sources = []
+    for fmt in ("avif", "webp"):
+        variants = image.get(fmt)
+        if variants:
+            srcset = ", ".join(f"{escape(url)} {width}w" for url, width in variants)
+            sources.append(f'<source type="image/{fmt}" srcset="{srcset}" sizes="{escape(sizes)}">')
+    fallback = image["fallback"]
+    img = (f'<img src="{escape(fallback["url"])}" width="{fallback["width"]}" height="{fallback["height"]}" '
+           f'alt="{escape(alt)}" loading="lazy" decoding="async"{attrs}>')
+    return f"<picture>{''.join(sources)}{img}</picture>"
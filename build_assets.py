@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Static Asset Builder
+Self-hosts a subset of the Poppins font as WOFF2 and converts the dashboard
+images to responsive WebP/AVIF variants. Every file gets a content-hashed
+name so it can be cached forever; assets/manifest.json maps the originals to
+the built files and is read by both dashboards at render time.
+
+Optional dependencies (only needed to run this build step):
+    pip install fonttools brotli Pillow
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import requests
+
+from assets import ASSETS_DIR, MANIFEST_FILE
+from publish import atomic_write_bytes, publish
+
+# fontTools (with brotli for WOFF2) and Pillow are optional
+try:
+    from fontTools import subset as font_subset
+    from fontTools.ttLib import TTFont
+    FONTTOOLS_AVAILABLE = True
+except ImportError:
+    FONTTOOLS_AVAILABLE = False
+
+try:
+    from PIL import Image, features
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+# Poppins weights used by the dashboards' stylesheets
+FONT_WEIGHTS = {
+    "300": "Poppins-Light.ttf",
+    "400": "Poppins-Regular.ttf",
+    "500": "Poppins-Medium.ttf",
+    "600": "Poppins-SemiBold.ttf",
+}
+FONT_SOURCE_URL = "https://github.com/google/fonts/raw/main/ofl/poppins/{filename}"
+
+# Images and the widths (in px) to build; the largest covers 2x displays
+IMAGES = {
+    "pedro.jpg": [150, 300, 600],
+    "grt.png": [50, 100],
+}
+
+# Dashboards whose text decides which glyphs the font subset keeps
+DASHBOARD_SOURCES = ["monitor_council_votes.py", "sample.py"]
+
+
+def content_hashed_name(stem: str, suffix: str, data: bytes) -> str:
+    """Return e.g. poppins-400.3f2a9c1b.woff2"""
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:8]}{suffix}"
+
+
+def write_asset(output_dir: Path, name: str, data: bytes) -> str:
+    """Write a built asset (once - its name is its content hash) and return
+    its URL relative to the dashboard"""
+    path = output_dir / ASSETS_DIR / name
+    if not path.exists():
+        atomic_write_bytes(path, data)
+    return f"{ASSETS_DIR}/{name}"
+
+
+def glyph_text(base_dir: Path) -> str:
+    """Characters the font subset must cover
+
+    Printable ASCII and Latin-1 (for proposal titles and member names) plus
+    every other character that appears in the dashboards' templates.
+    """
+    chars = {chr(code) for code in range(0x20, 0x7F)} | {chr(code) for code in range(0xA0, 0x100)}
+    for source in DASHBOARD_SOURCES:
+        path = base_dir / source
+        if path.exists():
+            chars.update(path.read_text(encoding="utf-8"))
+    return "".join(sorted(c for c in chars if c.isprintable()))
+
+
+def load_font_source(fonts_dir: Path, filename: str) -> bytes:
+    """Read a Poppins TTF from ``fonts_dir``, downloading it if missing"""
+    path = fonts_dir / filename
+    if not path.exists():
+        print(f"  Downloading {filename}...")
+        response = requests.get(FONT_SOURCE_URL.format(filename=filename), timeout=30)
+        response.raise_for_status()
+        fonts_dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(response.content)
+    return path.read_bytes()
+
+
+def build_fonts(fonts_dir: Path, output_dir: Path, text: str) -> Dict[str, str]:
+    """Subset every Poppins weight to ``text`` and write it as WOFF2
+
+    Returns:
+        dict: mapping weight -> asset URL
+    """
+    fonts = {}
+    for weight, filename in FONT_WEIGHTS.items():
+        font = TTFont(io.BytesIO(load_font_source(fonts_dir, filename)))
+        options = font_subset.Options()
+        options.flavor = "woff2"
+        options.layout_features = ["kern", "liga"]
+        options.name_IDs = []
+        options.notdef_outline = True
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(text=text)
+        subsetter.subset(font)
+
+        buffer = io.BytesIO()
+        font.flavor = "woff2"
+        font.save(buffer)
+        data = buffer.getvalue()
+        fonts[weight] = write_asset(output_dir, content_hashed_name(f"poppins-{weight}", ".woff2", data), data)
+        print(f"  ✓ Poppins {weight}: {len(data) / 1024:.1f} KB")
+    return fonts
+
+
+def encode_image(image: "Image.Image", fmt: str) -> bytes:
+    """Encode an image in the given Pillow format"""
+    buffer = io.BytesIO()
+    if fmt == "JPEG":
+        image.convert("RGB").save(buffer, "JPEG", quality=82, optimize=True, progressive=True)
+    elif fmt == "PNG":
+        image.save(buffer, "PNG", optimize=True)
+    elif fmt == "WEBP":
+        image.save(buffer, "WEBP", quality=80, method=6)
+    else:
+        image.save(buffer, "AVIF", quality=60)
+    return buffer.getvalue()
+
+
+def build_image(source: Path, widths: List[int], output_dir: Path) -> Dict:
+    """Build resized WebP/AVIF variants plus a resized fallback in the original format
+
+    Returns:
+        dict: manifest entry with ``fallback`` (url, width, height) and the
+        ``webp`` / ``avif`` variant lists of (url, width)
+    """
+    original = Image.open(source)
+    original.load()
+    fallback_format = "PNG" if source.suffix.lower() == ".png" else "JPEG"
+    formats = [("webp", "WEBP")]
+    if features.check("avif"):
+        formats.insert(0, ("avif", "AVIF"))
+
+    entry = {fmt: [] for fmt, _ in formats}
+    variants: List[Tuple[int, "Image.Image"]] = []
+    for width in sorted(w for w in widths if w <= original.width) or [original.width]:
+        height = round(original.height * width / original.width)
+        variants.append((width, original.resize((width, height), Image.LANCZOS)))
+
+    for width, image in variants:
+        for fmt, pillow_format in formats:
+            data = encode_image(image, pillow_format)
+            name = content_hashed_name(f"{source.stem}-{width}w", f".{fmt}", data)
+            entry[fmt].append((write_asset(output_dir, name, data), width))
+
+    # The fallback <img> is the middle (1x) size in the original format
+    width, image = variants[len(variants) // 2] if len(variants) > 1 else variants[0]
+    data = encode_image(image, fallback_format)
+    name = content_hashed_name(f"{source.stem}-{width}w", source.suffix.lower(), data)
+    entry["fallback"] = {"url": write_asset(output_dir, name, data), "width": width, "height": image.height}
+
+    built = sum(1 for fmt, _ in formats for _ in entry[fmt])
+    print(f"  ✓ {source.name}: {source.stat().st_size / 1024:.0f} KB -> {built} variant(s), "
+          f"{len(data) / 1024:.1f} KB fallback")
+    return entry
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Build self-hosted fonts and optimized images for the dashboards")
+    parser.add_argument("--output-dir", default=".",
+                        help="directory the dashboards are published in; assets go to OUTPUT_DIR/assets (default: .)")
+    parser.add_argument("--fonts-dir", default="fonts",
+                        help="directory with the Poppins TTF files, downloaded if missing (default: fonts)")
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).resolve().parent
+    output_dir = Path(args.output_dir)
+    (output_dir / ASSETS_DIR).mkdir(parents=True, exist_ok=True)
+    manifest = {}
+
+    if FONTTOOLS_AVAILABLE:
+        print("Building Poppins subset fonts...")
+        try:
+            manifest["fonts"] = build_fonts(Path(args.fonts_dir), output_dir, glyph_text(base_dir))
+        except (OSError, requests.exceptions.RequestException) as e:
+            print(f"  ✗ Could not build fonts: {e} - dashboards keep using Google Fonts")
+    else:
+        print("⚠️  fontTools not installed (pip install fonttools brotli) - dashboards keep using Google Fonts")
+
+    if PILLOW_AVAILABLE:
+        print("Building images...")
+        manifest["images"] = {}
+        for name, widths in IMAGES.items():
+            source = base_dir / name
+            if not source.exists():
+                print(f"  - {name} not found, skipping")
+                continue
+            manifest["images"][name] = build_image(source, widths, output_dir)
+    else:
+        print("⚠️  Pillow not installed (pip install Pillow) - dashboards keep using the original images")
+
+    if not manifest.get("fonts") and not manifest.get("images"):
+        print("✗ Nothing was built")
+        sys.exit(1)
+
+    publish(output_dir / ASSETS_DIR / MANIFEST_FILE, json.dumps(manifest, indent=2), compress=False)
+    print(f"✓ Wrote {output_dir / ASSETS_DIR / MANIFEST_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP helpers for the dashboards
+Per-host token-bucket rate limiting and 429/5xx-aware retries with jittered
+exponential backoff. Every attempt is recorded in the run metrics.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from metrics import METRICS, record_request
+
+# Status codes worth retrying: rate limited or a transient server error
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` requests per second on average
+    with bursts of up to ``burst`` requests"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket so no request goes out for ``seconds`` (used when
+        the server tells us to back off)"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._tokens = min(self._tokens, 1.0 - seconds * self.rate)
+            self._updated = time.monotonic()
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_rate_limit(host: str, requests_per_second: float, burst: int = 1) -> None:
+    """Set the request rate allowed for a host (0 disables limiting)"""
+    with _limiters_lock:
+        _limiters[host] = TokenBucket(requests_per_second, burst)
+
+
+def get_rate_limiter(url: str) -> Optional[TokenBucket]:
+    """Return the limiter shared by every request to the URL's host, if any"""
+    host = urlparse(url).netloc
+    with _limiters_lock:
+        return _limiters.get(host)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def past_deadline(deadline: Optional[float], delay: float = 0.0) -> bool:
+    """True if waiting ``delay`` seconds would take us past ``deadline`` (if any)"""
+    return deadline is not None and time.monotonic() + delay >= deadline
+
+
+def request_with_retries(method: str, url: str, session: requests.Session = None,
+                         max_retries: int = 3, backoff_base: float = 1.0,
+                         backoff_cap: float = 30.0, deadline: Optional[float] = None,
+                         **kwargs) -> requests.Response:
+    """Send an HTTP request through the host's rate limiter, retrying on 429,
+    transient 5xx responses and connection errors
+
+    A ``Retry-After`` header always takes precedence over the computed backoff.
+    With a ``deadline`` no attempt starts after it, each attempt's timeout is
+    cut to the time left, and no retry is scheduled past it.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        session: Session to send the request with (defaults to ``requests``)
+        max_retries: Number of retries after the first attempt
+        backoff_base: Base delay in seconds for exponential backoff
+        backoff_cap: Maximum delay in seconds between attempts
+        deadline: Optional ``time.monotonic()`` time by which the whole
+            call, retries included, must be finished
+        **kwargs: Passed through to ``session.request``
+
+    Returns:
+        requests.Response: the last response received (may still be an error
+        response if retries ran out)
+
+    Raises:
+        requests.exceptions.RequestException: if the last attempt failed
+        without a response (``Timeout`` if the deadline passed first)
+    """
+    sender = session or requests
+    limiter = get_rate_limiter(url)
+    host = urlparse(url).netloc
+    timeout = kwargs.pop("timeout", None)
+
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.acquire()
+        attempt_timeout = timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"{host}: deadline exceeded before the request was sent")
+            attempt_timeout = remaining if timeout is None else min(timeout, remaining)
+        started = time.perf_counter()
+        try:
+            response = sender.request(method, url, timeout=attempt_timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            record_request(host, "error", time.perf_counter() - started)
+            delay = backoff_delay(attempt, backoff_base, backoff_cap)
+            if not isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)) \
+                    or attempt == max_retries or past_deadline(deadline, delay):
+                raise
+            METRICS.increment("http_retries", host=host)
+            time.sleep(delay)
+            continue
+        record_request(host, response.status_code, time.perf_counter() - started, len(response.content))
+
+        if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        delay = retry_after if retry_after is not None else backoff_delay(attempt, backoff_base, backoff_cap)
+        if past_deadline(deadline, delay):
+            return response
+        METRICS.increment("http_retries", host=host)
+        print(f"  ↻ {host} returned {response.status_code}, retrying in {delay:.1f}s "
+              f"(attempt {attempt + 1}/{max_retries})")
+        if retry_after is not None and limiter and limiter.rate > 0:
+            # Hold back every request to this host, not just this one; the
+            # next acquire() waits out the delay
+            limiter.pause(retry_after)
+        else:
+            time.sleep(delay)
+
+    return response
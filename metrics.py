@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Run metrics for the dashboards
+Collects stage durations and per-host request counts, bytes, errors and cache
+hits during a run, and writes them as a Prometheus textfile-collector file
+(picked up by node_exporter) plus a JSON run record.
+
+Every value describes the last run, so all metrics are exported as gauges.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from publish import atomic_write_bytes
+
+METRIC_HELP = {
+    "run_success": "1 if the last run completed, 0 if it failed",
+    "run_timestamp_seconds": "Unix time the last run finished",
+    "run_duration_seconds": "Wall-clock duration of the last run",
+    "stage_duration_seconds": "Time spent in each stage of the last run",
+    "http_requests": "HTTP requests sent in the last run, by host and status (\"error\" if no response)",
+    "http_request_duration_seconds": "Total time spent waiting on HTTP requests in the last run, by host",
+    "http_received_bytes": "Response body bytes received in the last run, by host",
+    "http_errors": "HTTP requests that failed or returned an error status in the last run, by host",
+    "http_retries": "HTTP requests retried after a 429/5xx or connection error in the last run, by host",
+    "cache_lookups": "Cache lookups in the last run, by cache and result (hit/miss)",
+    "notifications": "Notification deliveries in the last run, by channel and result",
+    "snapshot_errors": "Snapshot queries that failed in the last run, by kind (request/graphql)",
+    "proposals": "Active proposals found in the last run",
+    "alerts": "Missing-vote alerts raised in the last run",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def label_key(labels: Dict[str, str]) -> LabelKey:
+    """Hashable, order-independent form of a label set"""
+    return tuple(sorted((label, str(label_value)) for label, label_value in labels.items()))
+
+
+class RunMetrics:
+    """Thread-safe store of named values with labels, reset at the start of each run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new run"""
+        with self._lock:
+            self.started = time.time()
+            self._values: Dict[str, Dict[LabelKey, float]] = {}
+
+    def start(self) -> None:
+        """Mark the start of the run, keeping values recorded since the last
+        reset (e.g. background deliveries between two watch-mode checks)"""
+        self.started = time.time()
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add ``amount`` to a value"""
+        key = label_key(labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Set a value"""
+        key = label_key(labels)
+        with self._lock:
+            self._values.setdefault(name, {})[key] = value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of work as stage ``name``"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.increment("stage_duration_seconds", time.perf_counter() - started, stage=name)
+
+    def snapshot(self) -> Dict[str, list]:
+        """Return every value as {name: [{"labels": {...}, "value": ...}]}"""
+        with self._lock:
+            return {
+                name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._values.items())
+            }
+
+    def finish(self, success: bool) -> Dict:
+        """Record the run's outcome and duration, and return the JSON run record"""
+        finished = time.time()
+        self.set("run_success", 1 if success else 0)
+        self.set("run_timestamp_seconds", round(finished, 3))
+        self.set("run_duration_seconds", finished - self.started)
+        return {
+            "started": datetime.fromtimestamp(self.started, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "finished": datetime.fromtimestamp(finished, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "duration_seconds": round(finished - self.started, 3),
+            "success": success,
+            "metrics": self.snapshot()
+        }
+
+
+# Process-wide metrics for the current run
+METRICS = RunMetrics()
+
+
+def record_request(host: str, status: Union[int, str], seconds: float, received: int = 0) -> None:
+    """Record one HTTP request attempt (``status`` is "error" if there was no response)"""
+    METRICS.increment("http_requests", host=host, status=status)
+    METRICS.increment("http_request_duration_seconds", seconds, host=host)
+    METRICS.increment("http_received_bytes", received, host=host)
+    if status == "error" or int(status) >= 400:
+        METRICS.increment("http_errors", host=host)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup"""
+    METRICS.increment("cache_lookups", cache=cache, result="hit" if hit else "miss")
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """Format a sample value without losing precision (e.g. timestamps)"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def prometheus_text(metrics: RunMetrics, prefix: str, info: Optional[Dict[str, str]] = None) -> str:
+    """Render the metrics in the Prometheus text exposition format"""
+    lines = []
+    if info:
+        labels = ",".join(f'{label}="{escape_label(str(value))}"' for label, value in sorted(info.items()))
+        lines += [f"# TYPE {prefix}info gauge", f"{prefix}info{{{labels}}} 1"]
+    for name, series in metrics.snapshot().items():
+        if name in METRIC_HELP:
+            lines.append(f"# HELP {prefix}{name} {METRIC_HELP[name]}")
+        lines.append(f"# TYPE {prefix}{name} gauge")
+        for sample in series:
+            labels = ",".join(f'{label}="{escape_label(value)}"' for label, value in sample["labels"].items())
+            series_name = f"{prefix}{name}{{{labels}}}" if labels else f"{prefix}{name}"
+            lines.append(f"{series_name} {format_value(sample['value'])}")
+    return "\n".join(lines) + "\n"
+
+
+def write_run_metrics(prom_path: str, json_path: str, success: bool, prefix: str = "grump_",
+                      info: Optional[Dict[str, str]] = None) -> None:
+    """Finish the run and write its metrics atomically
+
+    Args:
+        prom_path: Prometheus textfile (e.g. in node_exporter's
+            --collector.textfile.directory); empty to skip
+        json_path: JSON run record; empty to skip
+        success: Whether the run completed
+        prefix: Metric name prefix
+        info: Labels for a constant ``<prefix>info`` metric (e.g. version)
+    """
+    record = METRICS.finish(success)
+    if info:
+        record = {**info, **record}
+    for path, data in ((prom_path, prometheus_text(METRICS, prefix, info)),
+                       (json_path, json.dumps(record, indent=2))):
+        if not path:
+            continue
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, data.encode('utf-8'))
+        except OSError as e:
+            print(f"Warning: could not write metrics to {path}: {e}")
@@ -12,11 +12,27 @@ import os
 import sys
 import json
 import re
+import time
+import asyncio
+import argparse
+import hashlib
+import sqlite3
+import threading
+import statistics
+import io
 import requests
 from datetime import datetime, timezone
+from html import escape
 from pathlib import Path
-from typing import List, Dict, Set
+from string import Template
+from typing import Iterator, List, Dict, Set, TextIO
+from urllib.parse import urlparse
 from dotenv import load_dotenv
+from http_utils import configure_rate_limit, request_with_retries
+from publish import atomic_write_bytes, publish
+from notifiers import Notifier, NotifierError, create_notifier, send_all
+from metrics import METRICS, record_cache, write_run_metrics
+from assets import font_head_html, load_manifest, picture_html
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +43,7 @@ SNAPSHOT_SPACE = os.getenv("SNAPSHOT_SPACE", "council.graphprotocol.eth")
 ALERT_THRESHOLD_DAYS = int(os.getenv("ALERT_THRESHOLD_DAYS", "5"))
 WALLETS_FILE = os.getenv("WALLETS_FILE", "wallets.txt")
 OUTPUT_HTML = os.getenv("OUTPUT_HTML", "index.html")
+REPORT_JSON = os.getenv("REPORT_JSON", "Y").upper() == "Y"
 COUNCIL_MEMBERS_COUNT = int(os.getenv("COUNCIL_MEMBERS_COUNT", "6"))
 SHOW_COMPLETED_PROPOSALS = os.getenv("SHOW_COMPLETED_PROPOSALS", "N").upper() == "Y"
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "")
@@ -34,21 +51,116 @@ SLACK_MENTION_USERS = os.getenv("SLACK_MENTION_USERS", "")
 POST_TO_SLACK = os.getenv("POST_TO_SLACK", "N").upper() == "Y"
 PROPOSAL_MAX_AGE_DAYS = int(os.getenv("PROPOSAL_MAX_AGE_DAYS", "10"))
 FUN_MODE = os.getenv("FUN_MODE", "N").upper() == "Y"
+# Optional list of "space=wallets_file" pairs, comma-separated, to monitor
+# several spaces in one run (overrides SNAPSHOT_SPACE/WALLETS_FILE)
+SNAPSHOT_SPACES = os.getenv("SNAPSHOT_SPACES", "")
+MULTI_SPACE_REPORT = os.getenv("MULTI_SPACE_REPORT", "combined").lower()
+WATCH_INTERVAL_SECONDS = int(os.getenv("WATCH_INTERVAL_SECONDS", "300"))
+SHOW_PARTICIPATION_MATRIX = os.getenv("SHOW_PARTICIPATION_MATRIX", "Y").upper() == "Y"
+ARCHIVE_DB = os.getenv("ARCHIVE_DB", "grump_archive.db")
+ARCHIVE_ANALYTICS = os.getenv("ARCHIVE_ANALYTICS", "N").upper() == "Y"
+ARCHIVE_PAGE_SIZE = 1000
+SHOW_VOTE_TALLIES = os.getenv("SHOW_VOTE_TALLIES", "N").upper() == "Y"
+VOTES_BATCH_SIZE = int(os.getenv("VOTES_BATCH_SIZE", "20"))
+COUNCIL_VOTES_ONLY = os.getenv("COUNCIL_VOTES_ONLY", "Y").upper() == "Y"
+VOTES_PAGE_SIZE = int(os.getenv("VOTES_PAGE_SIZE", "1000"))
+SNAPSHOT_MAX_CONCURRENCY = int(os.getenv("SNAPSHOT_MAX_CONCURRENCY", "4"))
+STATE_DB = os.getenv("STATE_DB", "grump_state.db")
+INCREMENTAL_POLLING = os.getenv("INCREMENTAL_POLLING", "Y").upper() == "Y"
+SNAPSHOT_CACHE_DIR = os.getenv("SNAPSHOT_CACHE_DIR", ".cache/snapshot")
+SNAPSHOT_CACHE_TTL = int(os.getenv("SNAPSHOT_CACHE_TTL", "60"))
+SNAPSHOT_CACHE_MAX_ENTRIES = int(os.getenv("SNAPSHOT_CACHE_MAX_ENTRIES", "500"))
+SNAPSHOT_CACHE_BYPASS = os.getenv("SNAPSHOT_CACHE_BYPASS", "N").upper() == "Y"
+FRAGMENT_CACHE = os.getenv("FRAGMENT_CACHE", "Y").upper() == "Y"
+FRAGMENT_CACHE_DIR = os.getenv("FRAGMENT_CACHE_DIR", ".cache/fragments")
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "200"))
+CLOSED_PROPOSAL_STORE = os.getenv("CLOSED_PROPOSAL_STORE", "Y").upper() == "Y"
+CLOSED_PROPOSALS_DIR = os.getenv("CLOSED_PROPOSALS_DIR", "closed_proposals")
+SNAPSHOT_API_KEY = os.getenv("SNAPSHOT_API_KEY", "")
+SNAPSHOT_RATE_LIMIT = float(os.getenv("SNAPSHOT_RATE_LIMIT", "1"))
+SLACK_RATE_LIMIT = float(os.getenv("SLACK_RATE_LIMIT", "1"))
+SLACK_DIGEST = os.getenv("SLACK_DIGEST", "N").upper() == "Y"
+ALERT_LEDGER = os.getenv("ALERT_LEDGER", "Y").upper() == "Y"
+SLACK_RENOTIFY_HOURS = float(os.getenv("SLACK_RENOTIFY_HOURS", "24"))
+ALERT_ESCALATION_HOURS = float(os.getenv("ALERT_ESCALATION_HOURS", "48"))
+# Tolerate a scheduled run starting a little earlier than the day before
+RENOTIFY_GRACE_SECONDS = 900
+DASHBOARD_URL = "https://dashboards.thegraph.foundation/grump/"
 
+# Notification outbox (delivered in the background, retried with backoff)
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "30"))
+OUTBOX_BACKOFF_MAX = 3600
+OUTBOX_DRAIN_TIMEOUT = float(os.getenv("OUTBOX_DRAIN_TIMEOUT", "120"))
+OUTBOX_LEASE_SECONDS = 300
+OUTBOX_RETENTION_DAYS = 7
+# Notification channels: any of slack, telegram, webhook, file (comma-separated)
+NOTIFY_CHANNELS = [
+    channel.strip().lower()
+    for channel in os.getenv("NOTIFY_CHANNELS", "slack" if POST_TO_SLACK else "file").split(",")
+    if channel.strip()
+]
+SLACK_TIMEOUT = float(os.getenv("SLACK_TIMEOUT", "10"))
+TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
+TELEGRAM_RATE_LIMIT = float(os.getenv("TELEGRAM_RATE_LIMIT", "1"))
+TELEGRAM_TIMEOUT = float(os.getenv("TELEGRAM_TIMEOUT", "10"))
+NOTIFY_WEBHOOK_URL = os.getenv("NOTIFY_WEBHOOK_URL", "")
+NOTIFY_WEBHOOK_RATE_LIMIT = float(os.getenv("NOTIFY_WEBHOOK_RATE_LIMIT", "5"))
+NOTIFY_WEBHOOK_TIMEOUT = float(os.getenv("NOTIFY_WEBHOOK_TIMEOUT", "10"))
+SLACK_MESSAGE_FILE = os.getenv("SLACK_MESSAGE_FILE", "slack_message.txt")
+SLACK_MESSAGE_MAX_BYTES = int(os.getenv("SLACK_MESSAGE_MAX_BYTES", str(1024 * 1024)))
+SLACK_MESSAGE_BACKUPS = int(os.getenv("SLACK_MESSAGE_BACKUPS", "3"))
 
-def load_council_wallets() -> tuple[List[str], Dict[str, str]]:
+# Run metrics: Prometheus textfile for node_exporter and a JSON run record
+# (set to an empty value to disable)
+METRICS_PROM_FILE = os.getenv("METRICS_PROM_FILE", "grump.prom")
+METRICS_JSON_FILE = os.getenv("METRICS_JSON_FILE", "grump_run.json")
+
+# Slack Block Kit limits
+SLACK_MAX_BLOCKS = 50
+SLACK_MAX_SECTION_CHARS = 3000
+SLACK_MAX_HEADER_CHARS = 150
+SLACK_MAX_MESSAGE_BYTES = 40000
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "4"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "1"))
+
+# Every outbound request goes through a per-host rate limiter
+configure_rate_limit(urlparse(SNAPSHOT_API_URL).netloc, SNAPSHOT_RATE_LIMIT, burst=SNAPSHOT_MAX_CONCURRENCY)
+
+# Proposal fields used by the analysis and the HTML report. Extra fields can be
+# requested with PROPOSAL_EXTRA_FIELDS (comma-separated, e.g. "body,choices,author").
+PROPOSAL_FIELDS = ["id", "title", "start", "end", "state", "created", "votes"]
+PROPOSAL_EXTRA_FIELDS = [
+    field.strip() for field in os.getenv("PROPOSAL_EXTRA_FIELDS", "").split(",")
+    if re.fullmatch(r"[A-Za-z_]\w*", field.strip())
+]
+if SHOW_VOTE_TALLIES:
+    # Choice labels and voting type are needed to attribute voting power
+    PROPOSAL_FIELDS += ["choices", "type"]
+
+VOTE_FIELDS = ["id", "voter", "choice", "created"]
+
+
+def load_council_wallets(wallets_file: str = None) -> tuple[List[str], Dict[str, str]]:
     """Load council member wallet addresses and names from file
     
+    Args:
+        wallets_file: Path to the wallets file (defaults to WALLETS_FILE)
+    
     Returns:
         tuple: (list of wallet addresses, dict mapping address -> name)
+    
+    Raises:
+        FileNotFoundError: if the wallets file does not exist
     """
     wallets = []
     wallet_names = {}
-    wallet_path = Path(WALLETS_FILE)
+    wallets_file = wallets_file or WALLETS_FILE
+    wallet_path = Path(wallets_file)
     
     if not wallet_path.exists():
-        print(f"Error: Wallets file '{WALLETS_FILE}' not found!")
-        sys.exit(1)
+        raise FileNotFoundError(f"Wallets file '{wallets_file}' not found!")
     
     with open(wallet_path, 'r') as f:
         for line in f:
@@ -60,24 +172,140 @@ def load_council_wallets() -> tuple[List[str], Dict[str, str]]:
                     address, name = line.split(',', 1)
                     address = address.strip().lower()
                     name = name.strip()
-                    wallets.append(address)
-                    wallet_names[address] = name
                 else:
                     # Legacy format: just address
                     address = line.lower()
-                    wallets.append(address)
-                    wallet_names[address] = address
+                    name = address
+                
+                # Each wallet is one bit in the participation masks, so it
+                # may only be listed once
+                if address in wallet_names:
+                    print(f"Warning: wallet {address} is listed more than once in '{wallets_file}' - "
+                          f"keeping the first entry ({wallet_names[address]})")
+                    continue
+                wallets.append(address)
+                wallet_names[address] = name
     
     return wallets, wallet_names
 
 
-def query_snapshot(query: str, variables: dict = None) -> dict:
-    """Execute a GraphQL query against Snapshot API"""
+def parse_space_configs() -> List[tuple[str, str]]:
+    """Return the (space, wallets file) pairs to monitor
+    
+    Reads SNAPSHOT_SPACES ("space=wallets_file,..."); falls back to the single
+    SNAPSHOT_SPACE / WALLETS_FILE pair when it is not set.
+    """
+    configs = []
+    for entry in SNAPSHOT_SPACES.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        if "=" in entry:
+            space, wallets_file = entry.split("=", 1)
+            configs.append((space.strip(), wallets_file.strip()))
+        else:
+            configs.append((entry, WALLETS_FILE))
+    return configs or [(SNAPSHOT_SPACE, WALLETS_FILE)]
+
+
+_snapshot_session = None
+_snapshot_session_lock = threading.Lock()
+_notifiers = None
+_notifiers_lock = threading.Lock()
+_outbox_worker = None
+_outbox_worker_lock = threading.Lock()
+_outbox_wakeup = threading.Event()
+_outbox_idle = threading.Event()
+# Serializes index.json updates when several spaces finalize at once
+_closed_store_lock = threading.Lock()
+
+
+def get_snapshot_session() -> requests.Session:
+    """Return the shared, connection-pooled HTTP session for the Snapshot hub"""
+    global _snapshot_session
+    with _snapshot_session_lock:
+        if _snapshot_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(SNAPSHOT_MAX_CONCURRENCY, 1)
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _snapshot_session = session
+        return _snapshot_session
+
+
+def snapshot_cache_key(query: str, variables: dict = None) -> str:
+    """Hash a query and its variables into a response cache key"""
+    payload = json.dumps({"query": query, "variables": variables or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def read_snapshot_cache(key: str):
+    """Return a cached Snapshot response, or None if missing or expired"""
+    if SNAPSHOT_CACHE_BYPASS or SNAPSHOT_CACHE_TTL <= 0:
+        return None
+    cache_file = Path(SNAPSHOT_CACHE_DIR) / f"{key}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime > SNAPSHOT_CACHE_TTL:
+            return None
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot_cache(key: str, data) -> None:
+    """Store a Snapshot response and evict the oldest entries over the size limit"""
+    if SNAPSHOT_CACHE_BYPASS or SNAPSHOT_CACHE_TTL <= 0:
+        return
+    cache_dir = Path(SNAPSHOT_CACHE_DIR)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial entry
+        tmp_file = cache_dir / f"{key}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_file, cache_dir / f"{key}.json")
+        
+        entries = sorted(cache_dir.glob("*.json"), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:max(len(entries) - SNAPSHOT_CACHE_MAX_ENTRIES, 0)]:
+            entry.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Warning: could not write Snapshot cache: {e}")
+
+
+def query_snapshot(query: str, variables: dict = None, use_cache: bool = True) -> dict:
+    """Execute a GraphQL query against Snapshot API
+    
+    Synchronous entry point; AsyncSnapshotClient runs this in worker threads
+    to issue several requests at once over the same pooled session. Requests
+    are rate limited and retried on 429/5xx; successful responses are cached on
+    disk for SNAPSHOT_CACHE_TTL seconds. With ``use_cache=False`` the cached
+    entry is skipped (but still refreshed), e.g. when an event says it is stale.
+    """
+    cache_key = snapshot_cache_key(query, variables)
+    if use_cache:
+        cached = read_snapshot_cache(cache_key)
+        if not SNAPSHOT_CACHE_BYPASS and SNAPSHOT_CACHE_TTL > 0:
+            record_cache("snapshot", cached is not None)
+        if cached is not None:
+            return cached
+    
+    headers = {"Content-Type": "application/json"}
+    if SNAPSHOT_API_KEY:
+        headers["x-api-key"] = SNAPSHOT_API_KEY
+    
     try:
-        response = requests.post(
+        response = request_with_retries(
+            "POST",
             SNAPSHOT_API_URL,
+            session=get_snapshot_session(),
+            max_retries=HTTP_MAX_RETRIES,
+            backoff_base=HTTP_BACKOFF_BASE,
             json={"query": query, "variables": variables or {}},
-            headers={"Content-Type": "application/json"},
+            headers=headers,
             timeout=30
         )
         response.raise_for_status()
@@ -85,41 +313,103 @@ def query_snapshot(query: str, variables: dict = None) -> dict:
         
         if "errors" in data:
             print(f"GraphQL errors: {data['errors']}")
+            METRICS.increment("snapshot_errors", kind="graphql")
             return None
-            
+        
+        if data.get("data") is not None:
+            write_snapshot_cache(cache_key, data["data"])
         return data.get("data")
     except requests.exceptions.RequestException as e:
         print(f"API request failed: {e}")
+        METRICS.increment("snapshot_errors", kind="request")
         return None
 
 
-def fetch_active_proposals() -> List[Dict]:
-    """Fetch active proposals from the council space"""
-    query = """
-    query Proposals($space: String!) {
+class AsyncSnapshotClient:
+    """Asyncio front-end for the Snapshot hub with bounded concurrency
+    
+    Requests run in worker threads over the shared pooled session, and at most
+    ``max_concurrency`` of them are in flight at once. One client can be shared
+    by several analyses (e.g. one per space) running on the same event loop.
+    """
+    
+    def __init__(self, max_concurrency: int = None):
+        self.max_concurrency = max_concurrency or SNAPSHOT_MAX_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    async def query(self, query: str, variables: dict = None) -> dict:
+        """Execute a single GraphQL query"""
+        return await self.call(query_snapshot, query, variables)
+    
+    async def call(self, func, *args, **kwargs):
+        """Run a blocking Snapshot helper (which may issue several sequential
+        requests, e.g. paging) while holding one concurrency slot"""
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+
+def build_proposals_query(fields: List[str] = None, created_gte: int = None,
+                          state: str = "active", first: int = 50,
+                          order_direction: str = "desc") -> str:
+    """Build the GraphQL query used to list proposals in a space
+    
+    Args:
+        fields: Proposal fields to request (defaults to PROPOSAL_FIELDS plus
+            PROPOSAL_EXTRA_FIELDS)
+        created_gte: If set, only proposals created at or after this Unix
+            timestamp are returned (filtered on the server)
+        state: Proposal state to filter on (None for every state)
+        first: Maximum number of proposals to return
+        order_direction: "desc" (newest first) or "asc"
+    
+    Returns:
+        str: GraphQL query taking a ``$space`` variable (and ``$created`` when
+        ``created_gte`` is set)
+    """
+    if fields is None:
+        fields = PROPOSAL_FIELDS + [f for f in PROPOSAL_EXTRA_FIELDS if f not in PROPOSAL_FIELDS]
+    
+    variable_defs = "$space: String!"
+    state_filter = f',\n          state: "{state}"' if state else ""
+    created_filter = ""
+    if created_gte is not None:
+        variable_defs += ", $created: Int!"
+        created_filter = ",\n          created_gte: $created"
+    
+    selection = "\n".join(f"        {field}" for field in fields)
+    
+    return f"""
+    query Proposals({variable_defs}) {{
       proposals(
-        first: 50,
-        where: {
-          space: $space,
-          state: "active"
-        },
+        first: {first},
+        where: {{
+          space: $space{state_filter}{created_filter}
+        }},
         orderBy: "created",
-        orderDirection: desc
-      ) {
-        id
-        title
-        body
-        choices
-        start
-        end
-        state
-        author
-        created
-      }
-    }
+        orderDirection: {order_direction}
+      ) {{
+{selection}
+      }}
+    }}
+    """
+
+
+def fetch_active_proposals(fields: List[str] = None, space: str = None) -> List[Dict]:
+    """Fetch active proposals from the council space (defaults to SNAPSHOT_SPACE)
+    
+    Proposals older than PROPOSAL_MAX_AGE_DAYS are filtered out on the server,
+    and only the fields used by the analysis are requested unless ``fields``
+    (or PROPOSAL_EXTRA_FIELDS) asks for more.
     """
+    # days_old is truncated to whole days, so anything created less than
+    # PROPOSAL_MAX_AGE_DAYS + 1 days ago can still pass the age filter. The
+    # cutoff is floored to the hour so the query (and its cache key) stays the
+    # same between runs; the exact age filter is applied to the results.
+    now = int(datetime.now(timezone.utc).timestamp())
+    created_gte = (now - (PROPOSAL_MAX_AGE_DAYS + 1) * 86400 + 1) // 3600 * 3600
     
-    variables = {"space": SNAPSHOT_SPACE}
+    query = build_proposals_query(fields, created_gte=created_gte)
+    variables = {"space": space or SNAPSHOT_SPACE, "created": created_gte}
     result = query_snapshot(query, variables)
     
     if result and "proposals" in result:
@@ -127,30 +417,180 @@ def fetch_active_proposals() -> List[Dict]:
     return []
 
 
+def fetch_proposal(proposal_id: str, fields: List[str] = None, use_cache: bool = True) -> Dict:
+    """Fetch a single proposal by id (None if it does not exist)"""
+    if fields is None:
+        fields = PROPOSAL_FIELDS + [f for f in PROPOSAL_EXTRA_FIELDS if f not in PROPOSAL_FIELDS]
+    selection = "\n".join(f"        {field}" for field in fields)
+    query = f"""
+    query Proposal($id: String!) {{
+      proposal(id: $id) {{
+{selection}
+      }}
+    }}
+    """
+    result = query_snapshot(query, {"id": proposal_id}, use_cache=use_cache)
+    return result.get("proposal") if result else None
+
+
+def iter_votes_for_proposal(proposal_id: str, voters: List[str] = None,
+                            created_gte: int = 0, seen_ids: Set[str] = None,
+                            fields: List[str] = None, use_cache: bool = True) -> Iterator[List[Dict]]:
+    """Yield the votes of a proposal page by page, oldest first
+    
+    Pages are fetched with a ``created_gte`` cursor instead of a single capped
+    ``first: 1000`` request, so no votes are lost on busy proposals. Votes that
+    share the cursor timestamp are de-duplicated by id; if a whole page shares
+    one timestamp the pager falls back to ``skip`` within that second.
+    
+    Args:
+        proposal_id: Snapshot proposal id
+        voters: Optional list of voter addresses to filter on (``voter_in``)
+        created_gte: Timestamp to resume from
+        seen_ids: Ids of already-seen votes created at ``created_gte``
+        fields: Vote fields to request (defaults to id, voter, choice, created)
+        use_cache: Set to False to skip the Snapshot disk cache
+    
+    Yields:
+        list: the next page of votes (may be empty if it only held duplicates)
+    """
+    voter_def = ", $voters: [String!]" if voters else ""
+    voter_filter = ", voter_in: $voters" if voters else ""
+    selection = "\n".join(f"        {field}" for field in (fields or VOTE_FIELDS))
+    query = f"""
+    query Votes($proposal: String!, $created: Int!, $skip: Int!{voter_def}) {{
+      votes(
+        first: {VOTES_PAGE_SIZE},
+        skip: $skip,
+        where: {{
+          proposal: $proposal,
+          created_gte: $created{voter_filter}
+        }},
+        orderBy: "created",
+        orderDirection: asc
+      ) {{
+{selection}
+      }}
+    }}
+    """
+    
+    cursor = created_gte
+    skip = 0
+    boundary_ids = set(seen_ids or ())
+    
+    while True:
+        variables = {"proposal": proposal_id, "created": cursor, "skip": skip}
+        if voters:
+            variables["voters"] = voters
+        result = query_snapshot(query, variables, use_cache=use_cache)
+        page = result.get("votes") if result else None
+        if not page:
+            return
+        
+        yield [vote for vote in page if vote["id"] not in boundary_ids]
+        
+        if len(page) < VOTES_PAGE_SIZE:
+            return
+        
+        last_created = page[-1]["created"]
+        page_ids = {vote["id"] for vote in page if vote["created"] == last_created}
+        if last_created == cursor:
+            # Whole page inside one second: page through it with skip
+            skip += len(page)
+            boundary_ids |= page_ids
+        else:
+            cursor = last_created
+            skip = 0
+            boundary_ids = page_ids
+
+
 def fetch_votes_for_proposal(proposal_id: str) -> List[Dict]:
     """Fetch all votes for a specific proposal"""
-    query = """
-    query Votes($proposal: String!) {
-      votes(
-        first: 1000,
-        where: {
-          proposal: $proposal
-        }
-      ) {
+    return [vote for page in iter_votes_for_proposal(proposal_id) for vote in page]
+
+
+def fetch_votes_for_proposals(proposal_ids: List[str], voters: List[str] = None,
+                              created_gte: Dict[str, int] = None,
+                              use_cache: bool = True) -> Dict[str, List[Dict]]:
+    """Fetch votes for several proposals in as few GraphQL round trips as possible
+    
+    Each proposal gets its own aliased ``votes`` sub-query (``p0``, ``p1``, ...)
+    so the per-proposal ``first`` limit still applies, and the response is split
+    back out per proposal. Proposals are sent in chunks of VOTES_BATCH_SIZE.
+    
+    Args:
+        proposal_ids: Snapshot proposal ids
+        voters: Optional list of voter addresses. When given, votes are filtered
+            on the server with ``voter_in`` so at most one row per voter is returned.
+        created_gte: Optional mapping proposal id -> watermark timestamp; only
+            votes created at or after it are returned for that proposal.
+    
+    Returns:
+        dict: mapping proposal id -> list of votes (empty list if the fetch failed)
+    """
+    votes_by_proposal = {proposal_id: [] for proposal_id in proposal_ids}
+    created_gte = created_gte or {}
+    
+    if voters:
+        # A voter can only have one vote per proposal
+        limit = len(voters)
+        voter_filter = ", voter_in: $voters"
+    else:
+        limit = VOTES_PAGE_SIZE
+        voter_filter = ""
+    
+    for start in range(0, len(proposal_ids), VOTES_BATCH_SIZE):
+        chunk = proposal_ids[start:start + VOTES_BATCH_SIZE]
+        variable_defs = ", ".join(f"$p{i}: String!, $c{i}: Int!" for i in range(len(chunk)))
+        if voters:
+            variable_defs += ", $voters: [String!]"
+        sub_queries = "\n".join(
+            f"""      p{i}: votes(first: {limit}, where: {{ proposal: $p{i}, created_gte: $c{i}{voter_filter} }}, orderBy: "created", orderDirection: asc) {{
         id
         voter
         choice
         created
-      }
-    }
+      }}"""
+            for i in range(len(chunk))
+        )
+        query = f"""
+    query BatchedVotes({variable_defs}) {{
+{sub_queries}
+    }}
     """
+        
+        variables = {}
+        for i, proposal_id in enumerate(chunk):
+            variables[f"p{i}"] = proposal_id
+            variables[f"c{i}"] = created_gte.get(proposal_id, 0)
+        if voters:
+            variables["voters"] = voters
+        result = query_snapshot(query, variables, use_cache=use_cache)
+        
+        if not result:
+            continue
+        for i, proposal_id in enumerate(chunk):
+            votes_by_proposal[proposal_id] = result.get(f"p{i}") or []
     
-    variables = {"proposal": proposal_id}
-    result = query_snapshot(query, variables)
+    return votes_by_proposal
+
+
+def stream_proposal_votes(proposal_id: str, first_page: List[Dict],
+                          voters: List[str] = None) -> Iterator[List[Dict]]:
+    """Yield an already-fetched first page of votes, then page through the rest
     
-    if result and "votes" in result:
-        return result["votes"]
-    return []
+    The batched fetch returns the oldest page of every proposal; only proposals
+    whose first page came back full need further round trips.
+    """
+    yield first_page
+    
+    limit = len(voters) if voters else VOTES_PAGE_SIZE
+    if len(first_page) < limit:
+        return
+    
+    last_created = first_page[-1]["created"]
+    seen_ids = {vote["id"] for vote in first_page if vote["created"] == last_created}
+    yield from iter_votes_for_proposal(proposal_id, voters, last_created, seen_ids)
 
 
 def calculate_days_since(timestamp: int) -> int:
@@ -161,22 +601,578 @@ def calculate_days_since(timestamp: int) -> int:
     return delta.days
 
 
-def analyze_voting_status(council_wallets: List[str], wallet_names: Dict[str, str] = None) -> Dict:
-    """Analyze voting status for all active proposals"""
-    if wallet_names is None:
-        wallet_names = {}
+def open_state_db(path: str = None) -> sqlite3.Connection:
+    """Open (and create if needed) the local SQLite state store
     
-    proposals = fetch_active_proposals()
+    Holds the vote watermarks used for incremental polling: the newest vote
+    timestamp seen per proposal, and when each council wallet voted. Also
+    tracks which proposals were seen active, so they can be moved to the
+    closed-proposal store once they end, the running vote tallies, the
+    alert ledger of notifications already sent and the notification outbox.
+    """
+    conn = sqlite3.connect(path or STATE_DB)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS wallet_watermarks (
+            proposal_id TEXT NOT NULL,
+            wallet TEXT NOT NULL,
+            last_created INTEGER NOT NULL,
+            PRIMARY KEY (proposal_id, wallet)
+        );
+        CREATE TABLE IF NOT EXISTS council_vote_watermarks (
+            proposal_id TEXT NOT NULL,
+            voter TEXT NOT NULL,
+            created INTEGER NOT NULL,
+            PRIMARY KEY (proposal_id, voter)
+        );
+        CREATE TABLE IF NOT EXISTS tracked_proposals (
+            proposal_id TEXT PRIMARY KEY,
+            space TEXT NOT NULL,
+            end_time INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tally_watermarks (
+            proposal_id TEXT PRIMARY KEY,
+            last_created INTEGER NOT NULL,
+            boundary_ids TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tally_votes (
+            proposal_id TEXT NOT NULL,
+            voter TEXT NOT NULL,
+            created INTEGER NOT NULL,
+            choice TEXT NOT NULL,
+            vp REAL NOT NULL,
+            PRIMARY KEY (proposal_id, voter)
+        );
+        CREATE TABLE IF NOT EXISTS tally_totals (
+            proposal_id TEXT NOT NULL,
+            choice INTEGER NOT NULL,
+            vp REAL NOT NULL,
+            votes INTEGER NOT NULL,
+            PRIMARY KEY (proposal_id, choice)
+        );
+        CREATE TABLE IF NOT EXISTS alert_ledger (
+            proposal_id TEXT NOT NULL,
+            non_voters TEXT NOT NULL,
+            tier TEXT NOT NULL,
+            last_sent INTEGER NOT NULL,
+            PRIMARY KEY (proposal_id, non_voters, tier)
+        );
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel TEXT NOT NULL,
+            label TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created INTEGER NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt INTEGER NOT NULL,
+            last_error TEXT,
+            delivered INTEGER,
+            leased_until INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (delivered, next_attempt);
+    """)
+    # Outboxes created before delivery leases had their own column
+    if "leased_until" not in {column for _, column, *_ in conn.execute("PRAGMA table_info(outbox)")}:
+        conn.execute("ALTER TABLE outbox ADD COLUMN leased_until INTEGER NOT NULL DEFAULT 0")
+    return conn
+
+
+def load_vote_watermarks(conn: sqlite3.Connection, proposal_ids: List[str],
+                         council_wallets: List[str]) -> Dict[str, tuple[int, Set[str]]]:
+    """Load the stored watermarks and known council voters for each proposal
     
-    if not proposals:
-        return {
-            "proposals": [],
-            "alerts": [],
-            "summary": {
-                "total_proposals": 0,
-                "total_alerts": 0
-            }
+    Watermarks are kept per (proposal, council wallet). A wallet added to the
+    council since the last run has none yet, so the proposal is polled from
+    the start again and that member's earlier vote is not missed.
+    
+    Returns:
+        dict: mapping proposal id -> (``created_gte`` to poll from, set of
+        council wallets already known to have voted). Unknown proposals are
+        omitted.
+    """
+    watermarks = {}
+    for proposal_id in proposal_ids:
+        polled = dict(conn.execute(
+            "SELECT wallet, last_created FROM wallet_watermarks WHERE proposal_id = ?", (proposal_id,)
+        ))
+        if not polled:
+            continue
+        voters = {
+            voter for (voter,) in conn.execute(
+                "SELECT voter FROM council_vote_watermarks WHERE proposal_id = ?", (proposal_id,)
+            )
+        }
+        pending = [wallet for wallet in council_wallets if wallet not in voters]
+        watermarks[proposal_id] = (min((polled.get(wallet, 0) for wallet in pending), default=0), voters)
+    return watermarks
+
+
+def save_vote_watermarks(conn: sqlite3.Connection, proposal_id: str, voter_created: Dict[str, int],
+                         council_set: Set[str], previous_watermark: int = 0) -> None:
+    """Record newly seen votes for a proposal
+    
+    Advances the watermark of every council wallet to the newest vote seen
+    and stores the vote timestamp of every council wallet in ``voter_created``.
+    """
+    watermark = max([previous_watermark, *voter_created.values()])
+    conn.executemany(
+        "INSERT INTO wallet_watermarks (proposal_id, wallet, last_created) VALUES (?, ?, ?) "
+        "ON CONFLICT(proposal_id, wallet) DO UPDATE SET last_created = MAX(last_created, excluded.last_created)",
+        [(proposal_id, wallet, watermark) for wallet in council_set]
+    )
+    conn.executemany(
+        "INSERT INTO council_vote_watermarks (proposal_id, voter, created) VALUES (?, ?, ?) "
+        "ON CONFLICT(proposal_id, voter) DO UPDATE SET created = MAX(created, excluded.created)",
+        [(proposal_id, voter, created) for voter, created in voter_created.items() if voter in council_set]
+    )
+
+
+def track_proposals(conn: sqlite3.Connection, proposals: List[Dict], space: str = None) -> None:
+    """Remember active proposals so they can be finalized once they close"""
+    conn.executemany(
+        "INSERT INTO tracked_proposals (proposal_id, space, end_time) VALUES (?, ?, ?) "
+        "ON CONFLICT(proposal_id) DO UPDATE SET end_time = excluded.end_time",
+        [(p["id"], space or SNAPSHOT_SPACE, p["end"]) for p in proposals]
+    )
+
+
+def ended_tracked_proposals(conn: sqlite3.Connection, exclude_ids: List[str], space: str = None) -> List[str]:
+    """Return tracked proposals whose voting period is over"""
+    now = int(datetime.now(timezone.utc).timestamp())
+    rows = conn.execute(
+        "SELECT proposal_id FROM tracked_proposals WHERE space = ? AND end_time <= ?",
+        (space or SNAPSHOT_SPACE, now)
+    )
+    excluded = set(exclude_ids)
+    return [proposal_id for (proposal_id,) in rows if proposal_id not in excluded]
+
+
+def forget_proposals(conn: sqlite3.Connection, proposal_ids: List[str]) -> None:
+    """Drop all polling state for proposals that have been finalized"""
+    for table in ("tracked_proposals", "wallet_watermarks", "council_vote_watermarks",
+                  "tally_watermarks", "tally_votes", "tally_totals", "alert_ledger"):
+        conn.executemany(f"DELETE FROM {table} WHERE proposal_id = ?", [(pid,) for pid in proposal_ids])
+
+
+def choice_weights(choice, vp: float, voting_type: str = None) -> Dict[int, float]:
+    """Split a vote's voting power over the (1-based) choices it supports
+    
+    Single-choice and basic votes credit one choice; approval votes credit
+    every approved choice with the full voting power; ranked-choice votes
+    credit the first preference; weighted and quadratic votes are split in
+    proportion to their weights.
+    """
+    if isinstance(choice, int):
+        return {choice: vp}
+    if isinstance(choice, list):
+        if not choice:
+            return {}
+        if voting_type == "ranked-choice":
+            return {choice[0]: vp}
+        return {c: vp for c in choice}
+    if isinstance(choice, dict):
+        total = sum(choice.values())
+        if not total:
+            return {}
+        return {int(c): vp * weight / total for c, weight in choice.items()}
+    return {}
+
+
+def load_tally_watermark(conn: sqlite3.Connection, proposal_id: str) -> tuple[int, Set[str]]:
+    """Return (newest tallied vote timestamp, ids of tallied votes at that timestamp)"""
+    row = conn.execute(
+        "SELECT last_created, boundary_ids FROM tally_watermarks WHERE proposal_id = ?", (proposal_id,)
+    ).fetchone()
+    if row is None:
+        return 0, set()
+    return row[0], set(json.loads(row[1]))
+
+
+def fetch_new_tally_votes(proposal_id: str, created_gte: int = 0, seen_ids: Set[str] = None,
+                          use_cache: bool = True) -> List[Dict]:
+    """Fetch every vote (with voting power) created since the tally watermark"""
+    return [
+        vote
+        for page in iter_votes_for_proposal(proposal_id, created_gte=created_gte, seen_ids=seen_ids,
+                                            fields=VOTE_FIELDS + ["vp"], use_cache=use_cache)
+        for vote in page
+    ]
+
+
+def apply_tally_votes(conn: sqlite3.Connection, proposal: Dict, votes: List[Dict],
+                      watermark: tuple[int, Set[str]]) -> None:
+    """Fold newly fetched votes into a proposal's running tally
+    
+    Each vote is recorded per voter, so a re-vote first takes the voter's
+    previous choice back out of the totals. Only the new votes and the
+    proposal's handful of per-choice rows are touched.
+    """
+    proposal_id = proposal["id"]
+    voting_type = proposal.get("type")
+    totals = {
+        choice: [vp, count] for choice, vp, count in conn.execute(
+            "SELECT choice, vp, votes FROM tally_totals WHERE proposal_id = ?", (proposal_id,)
+        )
+    }
+    
+    last_created, boundary_ids = watermark
+    for vote in votes:
+        voter = vote["voter"].lower()
+        vp = vote.get("vp") or 0.0
+        previous = conn.execute(
+            "SELECT created, choice, vp FROM tally_votes WHERE proposal_id = ? AND voter = ?",
+            (proposal_id, voter)
+        ).fetchone()
+        if previous and previous[0] > vote["created"]:
+            continue
+        if previous:
+            for choice, weight in choice_weights(json.loads(previous[1]), previous[2], voting_type).items():
+                totals[choice][0] -= weight
+                totals[choice][1] -= 1
+        for choice, weight in choice_weights(vote["choice"], vp, voting_type).items():
+            entry = totals.setdefault(choice, [0.0, 0])
+            entry[0] += weight
+            entry[1] += 1
+        conn.execute(
+            "INSERT INTO tally_votes (proposal_id, voter, created, choice, vp) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(proposal_id, voter) DO UPDATE SET created = excluded.created, "
+            "choice = excluded.choice, vp = excluded.vp",
+            (proposal_id, voter, vote["created"], json.dumps(vote["choice"]), vp)
+        )
+        
+        if vote["created"] > last_created:
+            last_created, boundary_ids = vote["created"], set()
+        if vote["created"] == last_created:
+            boundary_ids.add(vote["id"])
+    
+    conn.executemany(
+        "INSERT INTO tally_totals (proposal_id, choice, vp, votes) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(proposal_id, choice) DO UPDATE SET vp = excluded.vp, votes = excluded.votes",
+        [(proposal_id, choice, vp, count) for choice, (vp, count) in totals.items()]
+    )
+    conn.execute(
+        "INSERT INTO tally_watermarks (proposal_id, last_created, boundary_ids) VALUES (?, ?, ?) "
+        "ON CONFLICT(proposal_id) DO UPDATE SET last_created = excluded.last_created, "
+        "boundary_ids = excluded.boundary_ids",
+        (proposal_id, last_created, json.dumps(sorted(boundary_ids)))
+    )
+
+
+def load_vote_tally(conn: sqlite3.Connection, proposal: Dict) -> List[Dict]:
+    """Return a proposal's per-choice tally, in the proposal's choice order
+    
+    Returns:
+        list: one dict per choice with ``choice`` (label), ``vp``, ``votes``
+        and ``share`` (fraction of the tallied voting power)
+    """
+    totals = {
+        choice: (vp, count) for choice, vp, count in conn.execute(
+            "SELECT choice, vp, votes FROM tally_totals WHERE proposal_id = ?", (proposal["id"],)
+        )
+    }
+    labels = proposal.get("choices") or []
+    total_vp = sum(vp for vp, _ in totals.values())
+    tally = []
+    for choice in range(1, max([len(labels), *totals.keys()]) + 1):
+        vp, count = totals.get(choice, (0.0, 0))
+        tally.append({
+            "choice": labels[choice - 1] if choice <= len(labels) else f"Choice {choice}",
+            "vp": vp,
+            "votes": count,
+            "share": vp / total_vp if total_vp else 0.0
+        })
+    return tally
+
+
+def load_closed_store_index() -> Dict[str, str]:
+    """Load the closed-proposal store index (proposal id -> content hash)"""
+    index_file = Path(CLOSED_PROPOSALS_DIR) / "index.json"
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_closed_proposal(proposal_id: str, index: Dict[str, str] = None) -> Dict:
+    """Return a finalized proposal and its council votes from the local store
+    
+    Returns:
+        dict: the stored record, or None if the proposal has not been finalized
+    """
+    if index is None:
+        index = load_closed_store_index()
+    digest = index.get(proposal_id)
+    if not digest:
+        return None
+    try:
+        with open(Path(CLOSED_PROPOSALS_DIR) / "objects" / f"{digest}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def put_closed_proposal(record: Dict) -> str:
+    """Write a finalized proposal to the content-addressed store
+    
+    Records are immutable: a proposal that is already in the store is never
+    rewritten. Safe to call from several threads at once.
+    
+    Returns:
+        str: the SHA-256 content hash the record is stored under
+    """
+    content = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    objects_dir = Path(CLOSED_PROPOSALS_DIR) / "objects"
+    
+    with _closed_store_lock:
+        index = load_closed_store_index()
+        if record["id"] in index:
+            return index[record["id"]]
+        
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        object_file = objects_dir / f"{digest}.json"
+        if not object_file.exists():
+            atomic_write_bytes(object_file, content.encode("utf-8"))
+        
+        index[record["id"]] = digest
+        atomic_write_bytes(Path(CLOSED_PROPOSALS_DIR) / "index.json",
+                           json.dumps(index, sort_keys=True, indent=1).encode("utf-8"))
+    return digest
+
+
+def finalize_closed_proposals(proposal_ids: List[str], council_wallets: List[str]) -> List[str]:
+    """Fetch proposals that just ended once more and store them permanently
+    
+    Each proposal and its council vote set is fetched a single time, when it is
+    first seen closed; afterwards it is served from the local store only.
+    
+    Returns:
+        list: ids of proposals that are now in the closed store
+    """
+    index = load_closed_store_index()
+    finalized = [proposal_id for proposal_id in proposal_ids if proposal_id in index]
+    pending = [proposal_id for proposal_id in proposal_ids if proposal_id not in index]
+    if not pending:
+        return finalized
+    
+    query = """
+    query ClosedProposals($ids: [String!]) {
+      proposals(first: 1000, where: { id_in: $ids, state: "closed" }) {
+        id
+        title
+        start
+        end
+        state
+        created
+        votes
+        space {
+          id
+        }
+      }
+    }
+    """
+    result = query_snapshot(query, {"ids": pending})
+    closed = result.get("proposals", []) if result else []
+    if not closed:
+        return finalized
+    
+    votes_by_proposal = fetch_votes_for_proposals([p["id"] for p in closed], voters=council_wallets)
+    for proposal in closed:
+        council_votes = {
+            vote["voter"].lower(): vote["created"] for vote in votes_by_proposal.get(proposal["id"], [])
+        }
+        record = {
+            "id": proposal["id"],
+            "space": (proposal.get("space") or {}).get("id", SNAPSHOT_SPACE),
+            "title": proposal["title"],
+            "start": proposal["start"],
+            "end": proposal["end"],
+            "created": proposal["created"],
+            "state": proposal["state"],
+            "total_votes": proposal.get("votes", 0),
+            "council_votes": council_votes
         }
+        put_closed_proposal(record)
+        finalized.append(proposal["id"])
+        print(f"  ✓ Archived closed proposal: {proposal['title']}")
+    
+    return finalized
+
+
+def collect_proposal_voters(proposal_id: str, first_page: List[Dict], vote_filter: List[str],
+                            council_set: Set[str]) -> tuple[Dict[str, int], int]:
+    """Stream a proposal's votes into a voter map
+    
+    Stops as soon as every wallet in ``council_set`` has been seen.
+    
+    Returns:
+        tuple: (dict mapping lowercase voter address -> vote timestamp,
+        number of votes streamed)
+    """
+    voters = {}
+    streamed_votes = 0
+    for page in stream_proposal_votes(proposal_id, first_page, voters=vote_filter):
+        for vote in page:
+            voters[vote["voter"].lower()] = vote["created"]
+        streamed_votes += len(page)
+        if council_set <= voters.keys():
+            break
+    return voters, streamed_votes
+
+
+def council_mask(voters, council_index: Dict[str, int]) -> int:
+    """Encode which council wallets voted as an integer bitmask
+    
+    Bit ``i`` is set when the wallet at index ``i`` of the council list voted.
+    """
+    mask = 0
+    for voter in voters:
+        index = council_index.get(voter)
+        if index is not None:
+            mask |= 1 << index
+    return mask
+
+
+def mask_members(mask: int, council_wallets: List[str]) -> List[str]:
+    """Return the council wallets whose bits are set in ``mask``, in council order"""
+    members = []
+    while mask:
+        lowest = mask & -mask
+        members.append(council_wallets[lowest.bit_length() - 1])
+        mask ^= lowest
+    return members
+
+
+def build_participation(council_wallets: List[str], proposals: List[Dict]) -> Dict:
+    """Build the proposal x member participation matrix for one council
+    
+    Returns:
+        dict: ``members`` (council wallets in bit order), ``proposals`` (ids),
+        ``masks`` (one bitmask per proposal) and ``member_totals`` (number of
+        listed proposals each member voted on)
+    """
+    masks = [p["council_mask"] for p in proposals]
+    return {
+        "members": list(council_wallets),
+        "proposals": [p["id"] for p in proposals],
+        "masks": masks,
+        "member_totals": [sum((mask >> i) & 1 for mask in masks) for i in range(len(council_wallets))]
+    }
+
+
+def build_proposal_result(proposal: Dict, voters: Set[str], council_wallets: List[str],
+                          space: str = None, streamed_votes: int = 0,
+                          council_index: Dict[str, int] = None, tally: List[Dict] = None) -> Dict:
+    """Build the analysis entry (non-voters, alerts, counts) for one proposal
+    
+    Args:
+        proposal: Proposal as returned by Snapshot
+        voters: Lowercase addresses known to have voted
+        council_wallets: Council member addresses (lowercase)
+        space: Snapshot space (defaults to SNAPSHOT_SPACE)
+        streamed_votes: Votes counted while streaming, used if the proposal
+            has no ``votes`` field
+        council_index: Mapping wallet -> bit index (built from
+            ``council_wallets`` if omitted)
+        tally: Optional per-choice voting power tally (see load_vote_tally())
+    """
+    if council_index is None:
+        council_index = {wallet: i for i, wallet in enumerate(council_wallets)}
+    
+    proposal_id = proposal["id"]
+    proposal_title = proposal["title"]
+    created_timestamp = proposal["created"]
+    end_timestamp = proposal["end"]
+    days_old = calculate_days_since(created_timestamp)
+    
+    # Calculate days left until proposal ends
+    now = datetime.now(timezone.utc)
+    end_date = datetime.fromtimestamp(end_timestamp, tz=timezone.utc)
+    days_left = (end_date - now).days
+    
+    # Council participation as a bitmask; non-voters are the cleared bits
+    mask = council_mask(voters, council_index)
+    all_members = (1 << len(council_wallets)) - 1
+    non_voters = mask_members(all_members & ~mask, council_wallets)
+    
+    # Generate alerts if threshold exceeded
+    alerts_for_proposal = []
+    if days_old >= ALERT_THRESHOLD_DAYS and non_voters:
+        for wallet in non_voters:
+            alerts_for_proposal.append({
+                "wallet": wallet,
+                "proposal_id": proposal_id,
+                "proposal_title": proposal_title,
+                "days_old": days_old
+            })
+    
+    result = {
+        "id": proposal_id,
+        "space": space or SNAPSHOT_SPACE,
+        "title": proposal_title,
+        "created": created_timestamp,
+        "end": end_timestamp,
+        "days_old": days_old,
+        "days_left": days_left,
+        "total_votes": proposal.get("votes", streamed_votes),
+        "council_votes": bin(mask).count("1"),
+        "council_mask": mask,
+        "council_non_voters": non_voters,
+        "alerts": alerts_for_proposal
+    }
+    if tally is not None:
+        result["tally"] = tally
+    return result
+
+
+def analyze_voting_status(council_wallets: List[str], wallet_names: Dict[str, str] = None,
+                          space: str = None) -> Dict:
+    """Analyze voting status for all active proposals
+    
+    Synchronous wrapper around analyze_voting_status_async().
+    """
+    return asyncio.run(analyze_voting_status_async(council_wallets, wallet_names, space=space))
+
+
+async def finalize_ended_proposals(client: "AsyncSnapshotClient", state_db: sqlite3.Connection,
+                                   active_ids: List[str], council_wallets: List[str], space: str) -> None:
+    """Write tracked proposals that ended since an earlier run to the closed
+    store (once; they are never fetched again) and drop their polling state
+    
+    Commits before awaiting so other spaces analyzed concurrently are not
+    blocked on the database lock.
+    """
+    ended = ended_tracked_proposals(state_db, active_ids, space)
+    state_db.commit()
+    if ended:
+        finalized = await client.call(finalize_closed_proposals, ended, council_wallets)
+        forget_proposals(state_db, finalized)
+        state_db.commit()
+
+
+async def analyze_voting_status_async(council_wallets: List[str], wallet_names: Dict[str, str] = None,
+                                      client: AsyncSnapshotClient = None, space: str = None,
+                                      members_count: int = None) -> Dict:
+    """Analyze voting status for all active proposals in a space
+    
+    Vote batches and per-proposal paging run concurrently through ``client``,
+    so the run takes about as long as its slowest request chain.
+    
+    Args:
+        council_wallets: Council member addresses (lowercase)
+        wallet_names: Mapping address -> display name
+        client: Shared client (a new one is created if omitted)
+        space: Snapshot space (defaults to SNAPSHOT_SPACE)
+        members_count: Expected council size (defaults to COUNCIL_MEMBERS_COUNT)
+    """
+    if wallet_names is None:
+        wallet_names = {}
+    if client is None:
+        client = AsyncSnapshotClient()
+    space = space or SNAPSHOT_SPACE
+    members_count = members_count or COUNCIL_MEMBERS_COUNT
+    
+    proposals = await client.call(fetch_active_proposals, space=space) or []
     
     # Filter proposals by max age
     now = datetime.now(timezone.utc)
@@ -188,7 +1184,17 @@ def analyze_voting_status(council_wallets: List[str], wallet_names: Dict[str, st
             filtered_proposals.append(proposal)
     
     if not filtered_proposals:
+        # The last active proposal may just have ended: still finalize it
+        if CLOSED_PROPOSAL_STORE:
+            state_db = open_state_db()
+            try:
+                await finalize_ended_proposals(client, state_db, [p["id"] for p in proposals],
+                                               council_wallets, space)
+            finally:
+                state_db.close()
         return {
+            "space": space,
+            "council_members_count": members_count,
             "proposals": [],
             "alerts": [],
             "summary": {
@@ -200,58 +1206,91 @@ def analyze_voting_status(council_wallets: List[str], wallet_names: Dict[str, st
     results = []
     all_alerts = []
     
+    council_set = set(council_wallets)
+    
+    # With incremental polling, only votes newer than the stored watermark are
+    # requested, and proposals every council wallet already voted on are skipped
+    state_db = open_state_db() if INCREMENTAL_POLLING or CLOSED_PROPOSAL_STORE or SHOW_VOTE_TALLIES else None
+    watermarks = {}
+    if INCREMENTAL_POLLING:
+        watermarks = load_vote_watermarks(state_db, [p["id"] for p in filtered_proposals], council_wallets)
+    proposal_ids = [
+        p["id"] for p in filtered_proposals
+        if not council_set <= watermarks.get(p["id"], (0, set()))[1]
+    ]
+    created_gte = {proposal_id: watermarks[proposal_id][0] for proposal_id in proposal_ids
+                   if proposal_id in watermarks}
+    
+    # Fetch the first page of votes for every proposal in batched round trips
+    # (one per VOTES_BATCH_SIZE proposals, issued concurrently). In council-only
+    # mode the hub only returns council votes; the total comes from the
+    # proposal's own vote count.
+    vote_filter = council_wallets if COUNCIL_VOTES_ONLY else None
+    batches = await asyncio.gather(*(
+        client.call(fetch_votes_for_proposals, proposal_ids[i:i + VOTES_BATCH_SIZE], vote_filter, created_gte)
+        for i in range(0, len(proposal_ids), VOTES_BATCH_SIZE)
+    ))
+    votes_by_proposal = {}
+    for batch in batches:
+        votes_by_proposal.update(batch)
+    
+    # Page through the remaining votes of each proposal concurrently
+    voter_results = await asyncio.gather(*(
+        client.call(collect_proposal_voters, proposal_id, votes_by_proposal.get(proposal_id, []),
+                    vote_filter, council_set - watermarks.get(proposal_id, (0, set()))[1])
+        for proposal_id in proposal_ids
+    ))
+    new_voters = dict(zip(proposal_ids, voter_results))
+    
+    # Merge the delta with what earlier runs already recorded
+    voters_by_proposal = {}
     for proposal in filtered_proposals:
         proposal_id = proposal["id"]
-        proposal_title = proposal["title"]
-        created_timestamp = proposal["created"]
-        end_timestamp = proposal["end"]
-        days_old = calculate_days_since(created_timestamp)
-        
-        # Calculate days left until proposal ends
-        now = datetime.now(timezone.utc)
-        end_date = datetime.fromtimestamp(end_timestamp, tz=timezone.utc)
-        days_left = (end_date - now).days
-        
-        # Fetch votes for this proposal
-        votes = fetch_votes_for_proposal(proposal_id)
-        voters = {vote["voter"].lower() for vote in votes}
-        
-        # Find who hasn't voted
-        non_voters = []
-        for wallet in council_wallets:
-            if wallet not in voters:
-                non_voters.append(wallet)
-        
-        # Generate alerts if threshold exceeded
-        alerts_for_proposal = []
-        if days_old >= ALERT_THRESHOLD_DAYS and non_voters:
-            for wallet in non_voters:
-                alert = {
-                    "wallet": wallet,
-                    "proposal_id": proposal_id,
-                    "proposal_title": proposal_title,
-                    "days_old": days_old
-                }
-                alerts_for_proposal.append(alert)
-                all_alerts.append(alert)
-        
-        results.append({
-            "id": proposal_id,
-            "title": proposal_title,
-            "created": created_timestamp,
-            "end": end_timestamp,
-            "days_old": days_old,
-            "days_left": days_left,
-            "total_votes": len(votes),
-            "council_votes": len([w for w in council_wallets if w in voters]),
-            "council_non_voters": non_voters,
-            "alerts": alerts_for_proposal
-        })
+        watermark, known_voters = watermarks.get(proposal_id, (0, set()))
+        voter_created, streamed_votes = new_voters.get(proposal_id, ({}, 0))
+        voters_by_proposal[proposal_id] = (known_voters | voter_created.keys(), streamed_votes)
+        if INCREMENTAL_POLLING and proposal_id in new_voters:
+            save_vote_watermarks(state_db, proposal_id, voter_created, council_set, watermark)
+    
+    # Vote tallies: fetch only the votes created since each proposal's tally
+    # watermark and fold them into the running per-choice totals
+    tallies = {}
+    if SHOW_VOTE_TALLIES:
+        tally_watermarks = {p["id"]: load_tally_watermark(state_db, p["id"]) for p in filtered_proposals}
+        # Don't hold the write lock across the fetch: other spaces share the
+        # state database and would fail with "database is locked"
+        state_db.commit()
+        new_tally_votes = await asyncio.gather(*(
+            client.call(fetch_new_tally_votes, proposal_id, *tally_watermarks[proposal_id])
+            for proposal_id in tally_watermarks
+        ))
+        for proposal, votes in zip(filtered_proposals, new_tally_votes):
+            apply_tally_votes(state_db, proposal, votes, tally_watermarks[proposal["id"]])
+            tallies[proposal["id"]] = load_vote_tally(state_db, proposal)
+    
+    if state_db:
+        if CLOSED_PROPOSAL_STORE:
+            track_proposals(state_db, filtered_proposals, space)
+            await finalize_ended_proposals(client, state_db, [p["id"] for p in proposals], council_wallets, space)
+        state_db.commit()
+        state_db.close()
+    
+    # Every council wallet gets a fixed bit index for the participation matrix
+    council_index = {wallet: i for i, wallet in enumerate(council_wallets)}
+    for proposal in filtered_proposals:
+        voters, streamed_votes = voters_by_proposal[proposal["id"]]
+        result = build_proposal_result(proposal, voters, council_wallets, space, streamed_votes, council_index,
+                                       tallies.get(proposal["id"]))
+        results.append(result)
+        all_alerts.extend(result["alerts"])
     
     return {
+        "space": space,
+        "council_members_count": members_count,
         "proposals": results,
         "alerts": all_alerts,
         "wallet_names": wallet_names,
+        "participation": {space: build_participation(council_wallets, results)},
         "summary": {
             "total_proposals": len(filtered_proposals),
             "total_alerts": len(all_alerts)
@@ -259,33 +1298,262 @@ def analyze_voting_status(council_wallets: List[str], wallet_names: Dict[str, st
     }
 
 
-def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
-    """Generate HTML report with voting status"""
-    timestamp = datetime.now(timezone.utc).strftime("%d %b %Y at %H:%M (UTC)")
+async def analyze_spaces_async(councils: List[tuple[str, List[str], Dict[str, str]]]) -> List[Dict]:
+    """Analyze several spaces concurrently through one shared, pooled client
     
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
+    Args:
+        councils: List of (space, council wallets, wallet names) tuples
+    
+    Returns:
+        list: one analysis dict per space, in the same order
+    """
+    client = AsyncSnapshotClient()
+    analyses = []
+    for space, council_wallets, wallet_names in councils:
+        # Each space has its own council; with a single space the configured
+        # COUNCIL_MEMBERS_COUNT applies
+        members_count = COUNCIL_MEMBERS_COUNT if len(councils) == 1 else len(council_wallets)
+        analyses.append(analyze_voting_status_async(
+            council_wallets, wallet_names, client=client, space=space, members_count=members_count
+        ))
+    return list(await asyncio.gather(*analyses))
+
+
+def merge_space_reports(reports: List[Dict]) -> Dict:
+    """Combine per-space analyses into one report covering every space"""
+    if len(reports) == 1:
+        return reports[0]
+    
+    proposals = []
+    alerts = []
+    wallet_names = {}
+    participation = {}
+    analytics = {}
+    for report in reports:
+        for proposal in report["proposals"]:
+            proposals.append({**proposal, "council_members_count": report["council_members_count"]})
+        alerts.extend(report["alerts"])
+        wallet_names.update(report.get("wallet_names", {}))
+        participation.update(report.get("participation", {}))
+        analytics.update(report.get("analytics", {}))
+    
+    return {
+        "space": reports[0]["space"],
+        "spaces": [report["space"] for report in reports],
+        "council_members_count": sum(report["council_members_count"] for report in reports),
+        "proposals": proposals,
+        "alerts": alerts,
+        "wallet_names": wallet_names,
+        "participation": participation,
+        "analytics": analytics,
+        "summary": {
+            "total_proposals": sum(report["summary"]["total_proposals"] for report in reports),
+            "total_alerts": len(alerts)
+        }
+    }
+
+
+def space_output_path(space: str) -> str:
+    """Return the per-space report path, e.g. index-council.graphprotocol.eth.html"""
+    output = Path(OUTPUT_HTML)
+    return str(output.with_name(f"{output.stem}-{space}{output.suffix}"))
+
+
+def open_archive_db(path: str = None) -> sqlite3.Connection:
+    """Open (and create if needed) the historical vote archive"""
+    conn = sqlite3.connect(path or ARCHIVE_DB)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS archive_proposals (
+            id TEXT PRIMARY KEY,
+            space TEXT NOT NULL,
+            title TEXT NOT NULL,
+            created INTEGER NOT NULL,
+            start INTEGER NOT NULL,
+            end_time INTEGER NOT NULL,
+            state TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS archive_votes (
+            voter TEXT NOT NULL,
+            proposal_id TEXT NOT NULL,
+            created INTEGER NOT NULL,
+            choice TEXT,
+            PRIMARY KEY (voter, proposal_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_archive_proposals_space_created
+            ON archive_proposals (space, created);
+        CREATE INDEX IF NOT EXISTS idx_archive_votes_created
+            ON archive_votes (created);
+        CREATE INDEX IF NOT EXISTS idx_archive_votes_proposal
+            ON archive_votes (proposal_id);
+    """)
+    return conn
+
+
+def sync_archive(conn: sqlite3.Connection, space: str, council_wallets: List[str]) -> int:
+    """Backfill or append a space's proposals and council votes to the archive
+    
+    The first call pages through every proposal ever created in the space;
+    later calls only fetch proposals created since the newest archived one,
+    plus fresh council votes for archived proposals that have not closed yet.
+    Closed proposals already in the closed-proposal store are read locally.
+    
+    Returns:
+        int: number of proposals added or refreshed
+    """
+    row = conn.execute("SELECT MAX(created) FROM archive_proposals WHERE space = ?", (space,)).fetchone()
+    cursor = row[0] or 0
+    fields = ["id", "title", "created", "start", "end", "state"]
+    query = build_proposals_query(fields, created_gte=0, state=None, first=ARCHIVE_PAGE_SIZE,
+                                  order_direction="asc")
+    
+    # Page through new proposals (created_gte cursor, de-duplicated by id)
+    new_proposals = {}
+    while True:
+        result = query_snapshot(query, {"space": space, "created": cursor})
+        page = result.get("proposals", []) if result else []
+        fresh = [p for p in page if p["id"] not in new_proposals]
+        for proposal in fresh:
+            new_proposals[proposal["id"]] = proposal
+        if len(page) < ARCHIVE_PAGE_SIZE or not fresh:
+            break
+        cursor = page[-1]["created"]
+    
+    conn.executemany(
+        "INSERT INTO archive_proposals (id, space, title, created, start, end_time, state) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+        "title = excluded.title, end_time = excluded.end_time, state = excluded.state",
+        [(p["id"], space, p["title"], p["created"], p["start"], p["end"], p["state"])
+         for p in new_proposals.values()]
+    )
+    
+    # Council votes: new proposals, plus archived ones that were still open
+    open_ids = [proposal_id for (proposal_id,) in conn.execute(
+        "SELECT id FROM archive_proposals WHERE space = ? AND state != 'closed'", (space,)
+    )]
+    refresh_ids = list(dict.fromkeys(list(new_proposals) + open_ids))
+    
+    closed_index = load_closed_store_index()
+    votes_rows = []
+    to_fetch = []
+    for proposal_id in refresh_ids:
+        stored = get_closed_proposal(proposal_id, closed_index)
+        if stored:
+            votes_rows.extend((voter, proposal_id, created, None)
+                              for voter, created in stored["council_votes"].items())
+            conn.execute("UPDATE archive_proposals SET state = 'closed' WHERE id = ?", (proposal_id,))
+        else:
+            to_fetch.append(proposal_id)
+    
+    if to_fetch:
+        votes_by_proposal = fetch_votes_for_proposals(to_fetch, voters=council_wallets)
+        for proposal_id, votes in votes_by_proposal.items():
+            votes_rows.extend((vote["voter"].lower(), proposal_id, vote["created"], json.dumps(vote["choice"]))
+                              for vote in votes)
+        if open_ids:
+            # Pick up state changes (active -> closed) of previously open proposals
+            states = query_snapshot(
+                'query States($ids: [String!]) { proposals(first: 1000, where: { id_in: $ids }) { id state end } }',
+                {"ids": [pid for pid in open_ids if pid in to_fetch]}
+            )
+            conn.executemany(
+                "UPDATE archive_proposals SET state = ?, end_time = ? WHERE id = ?",
+                [(p["state"], p["end"], p["id"]) for p in (states or {}).get("proposals", [])]
+            )
+    
+    conn.executemany(
+        "INSERT INTO archive_votes (voter, proposal_id, created, choice) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(voter, proposal_id) DO UPDATE SET created = excluded.created, "
+        "choice = COALESCE(excluded.choice, choice)",
+        votes_rows
+    )
+    conn.commit()
+    return len(refresh_ids)
+
+
+def member_analytics(conn: sqlite3.Connection, space: str, council_wallets: List[str]) -> List[Dict]:
+    """Participation statistics per council member over the archived history
+    
+    Only proposals whose voting period is over are counted.
+    
+    Returns:
+        list: one dict per member with ``wallet``, ``voted``, ``proposals``,
+        ``participation_rate`` (0-1), ``median_hours_to_vote`` (None if the
+        member never voted), ``current_streak`` and ``longest_streak``
+    """
+    now = int(datetime.now(timezone.utc).timestamp())
+    proposal_ids = [proposal_id for (proposal_id,) in conn.execute(
+        "SELECT id FROM archive_proposals WHERE space = ? AND end_time <= ? ORDER BY created",
+        (space, now)
+    )]
+    
+    analytics = []
+    for wallet in council_wallets:
+        rows = conn.execute(
+            "SELECT v.proposal_id, v.created - p.start FROM archive_votes v "
+            "JOIN archive_proposals p ON p.id = v.proposal_id "
+            "WHERE v.voter = ? AND p.space = ? AND p.end_time <= ?",
+            (wallet, space, now)
+        ).fetchall()
+        voted_ids = {proposal_id for proposal_id, _ in rows}
+        delays = [max(delay, 0) for _, delay in rows]
+        
+        longest = streak = 0
+        for proposal_id in proposal_ids:
+            streak = streak + 1 if proposal_id in voted_ids else 0
+            longest = max(longest, streak)
+        
+        analytics.append({
+            "wallet": wallet,
+            "voted": len(voted_ids),
+            "proposals": len(proposal_ids),
+            "participation_rate": len(voted_ids) / len(proposal_ids) if proposal_ids else 0.0,
+            "median_hours_to_vote": statistics.median(delays) / 3600 if delays else None,
+            "current_streak": streak,
+            "longest_streak": longest
+        })
+    return analytics
+
+
+def attach_archive_analytics(reports: List[Dict], councils: List[tuple[str, List[str], Dict[str, str]]]) -> None:
+    """Sync the archive for every space and add its analytics to the reports"""
+    conn = open_archive_db()
+    try:
+        for report, (space, council_wallets, _) in zip(reports, councils):
+            sync_archive(conn, space, council_wallets)
+            report["analytics"] = {space: member_analytics(conn, space, council_wallets)}
+    finally:
+        conn.close()
+
+
+# HTML report templates. The static <head> (including the stylesheet) and the
+# page scaffolding are built once per process; each report only substitutes
+# the (HTML-escaped) values into them, section by section.
+ASSET_MANIFEST = load_manifest(Path(OUTPUT_HTML).parent)
+PEDRO_PICTURE_STYLE = "max-width: 300px; border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.3);"
+
+REPORT_HEAD = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>The Graph Council Voting Monitor</title>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600&display=swap" rel="stylesheet">
+    $font_tags
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Poppins', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: #0C0A1D;
             min-height: 100vh;
             padding: 20px;
             color: #F8F6FF;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: #0C0A1D;
@@ -293,125 +1561,125 @@ def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
             box-shadow: 0 20px 40px rgba(0,0,0,0.3);
             overflow: hidden;
             border: 1px solid #9CA3AF;
-        }}
+        }
         
-        .header {{
+        .header {
             background: #0C0A1D;
             color: #F8F6FF;
             padding: 30px;
             border-bottom: 1px solid #9CA3AF;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.2em;
             margin-bottom: 0.5rem;
             font-weight: 300;
-        }}
+        }
         
-        .header p {{
+        .header p {
             opacity: 0.9;
             font-size: 0.95rem;
             font-weight: 300;
-        }}
+        }
         
-        .header-link {{
+        .header-link {
             color: #F8F6FF;
             text-decoration: none;
             transition: opacity 0.3s ease;
-        }}
+        }
         
-        .header-link:hover {{
+        .header-link:hover {
             opacity: 0.7;
             text-decoration: underline;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 30px;
             background: #0C0A1D;
-        }}
+        }
         
-        .summary {{
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
             padding: 25px 0;
             border-bottom: 1px solid #9CA3AF;
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             display: flex;
             flex-direction: column;
             align-items: center;
             gap: 8px;
-        }}
+        }
         
-        .summary-card h3 {{
+        .summary-card h3 {
             color: #9CA3AF;
             font-size: 14px;
             font-weight: 500;
             text-align: center;
-        }}
+        }
         
-        .summary-card .value {{
+        .summary-card .value {
             color: #F8F6FF;
             font-size: 32px;
             font-weight: 600;
             text-align: center;
-        }}
+        }
         
-        .summary-card.alert-count .value {{
+        .summary-card.alert-count .value {
             color: #ef4444;
-        }}
+        }
         
-        .summary-card.proposal-count .value {{
+        .summary-card.proposal-count .value {
             color: #fbbf24;
-        }}
+        }
         
-        .summary-card.member-count .value {{
+        .summary-card.member-count .value {
             color: #22c55e;
-        }}
+        }
         
-        .alert-section {{
+        .alert-section {
             margin-bottom: 30px;
-        }}
+        }
         
-        .section-title {{
+        .section-title {
             font-size: 1.5rem;
             margin-bottom: 20px;
             color: #F8F6FF;
             font-weight: 500;
-        }}
+        }
         
-        .alert-box {{
+        .alert-box {
             background: rgba(239, 68, 68, 0.1);
             border-left: 4px solid #ef4444;
             border-radius: 8px;
             padding: 20px;
             margin-bottom: 15px;
             border: 1px solid #ef4444;
-        }}
+        }
         
-        .alert-box.warning {{
+        .alert-box.warning {
             background: rgba(239, 68, 68, 0.15);
             border-left-color: #ef4444;
-        }}
+        }
         
-        .alert-title {{
+        .alert-title {
             font-weight: 600;
             margin-bottom: 10px;
             color: #ef4444;
             font-size: 1.1rem;
-        }}
+        }
         
-        .alert-details {{
+        .alert-details {
             color: #9CA3AF;
             margin-top: 8px;
             font-size: 14px;
-        }}
+        }
         
-        .wallet-address {{
+        .wallet-address {
             font-family: 'Courier New', monospace;
             background: rgba(156, 163, 175, 0.1);
             padding: 8px 12px;
@@ -423,9 +1691,9 @@ def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
             font-size: 13px;
             border: 1px solid #9CA3AF;
             color: #F8F6FF;
-        }}
+        }
         
-        .copy-btn {{
+        .copy-btn {
             background: rgba(156, 163, 175, 0.2);
             color: #9CA3AF;
             border: 1px solid #9CA3AF;
@@ -435,53 +1703,53 @@ def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
             font-size: 11px;
             font-weight: 500;
             transition: all 0.3s ease;
-        }}
+        }
         
-        .copy-btn:hover {{
+        .copy-btn:hover {
             background: rgba(156, 163, 175, 0.3);
             opacity: 0.8;
             transform: translateY(-1px);
-        }}
+        }
         
-        .copy-btn:active {{
+        .copy-btn:active {
             transform: scale(0.95);
-        }}
+        }
         
-        .copy-btn.copied {{
+        .copy-btn.copied {
             background: #22c55e;
             color: #0C0A1D;
             border-color: #22c55e;
-        }}
+        }
         
-        .proposal-card {{
+        .proposal-card {
             background: rgba(156, 163, 175, 0.05);
             border-radius: 12px;
             padding: 20px;
             margin-bottom: 20px;
             border: 1px solid #9CA3AF;
             transition: all 0.2s ease;
-        }}
+        }
         
-        .proposal-card:hover {{
+        .proposal-card:hover {
             background: #1a1825;
             transform: translateY(-2px);
-        }}
+        }
         
-        .proposal-header {{
+        .proposal-header {
             display: flex;
             justify-content: space-between;
             align-items: start;
             margin-bottom: 15px;
-        }}
+        }
         
-        .proposal-title {{
+        .proposal-title {
             font-size: 1.2rem;
             font-weight: 500;
             color: #F8F6FF;
             flex: 1;
-        }}
+        }
         
-        .proposal-badge {{
+        .proposal-badge {
             background: rgba(34, 197, 94, 0.2);
             color: #22c55e;
             border: 1px solid #22c55e;
@@ -490,15 +1758,15 @@ def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
             font-size: 11px;
             font-weight: 500;
             margin-left: 15px;
-        }}
+        }
         
-        .proposal-badge.old {{
+        .proposal-badge.old {
             background: rgba(251, 191, 36, 0.2);
             color: #fbbf24;
             border-color: #fbbf24;
-        }}
+        }
         
-        .days-left-badge {{
+        .days-left-badge {
             background: rgba(34, 197, 94, 0.2);
             color: #22c55e;
             border: 1px solid #22c55e;
@@ -507,369 +1775,439 @@ def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
             font-size: 11px;
             font-weight: 500;
             margin-left: 10px;
-        }}
+        }
         
-        .days-left-badge.urgent {{
+        .days-left-badge.urgent {
             background: rgba(239, 68, 68, 0.2);
             color: #ef4444;
             border-color: #ef4444;
-        }}
+        }
         
-        .days-left-badge.soon {{
+        .days-left-badge.soon {
             background: rgba(251, 191, 36, 0.2);
             color: #fbbf24;
             border-color: #fbbf24;
-        }}
+        }
         
-        .proposal-alerts {{
+        .proposal-alerts {
             margin-top: 15px;
-        }}
+        }
         
-        .proposal-alerts .alert-box {{
+        .proposal-alerts .alert-box {
             margin-bottom: 0;
-        }}
+        }
         
-        .proposal-stats {{
+        .proposal-stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .stat {{
+        .stat {
             font-size: 14px;
             color: #9CA3AF;
-        }}
+        }
         
-        .stat strong {{
+        .stat strong {
             color: #F8F6FF;
-        }}
+        }
         
-        .stat .vote-count {{
+        .stat .vote-count {
             font-weight: 600;
-        }}
+        }
         
-        .stat .vote-count.all-voted {{
+        .stat .vote-count.all-voted {
             color: #22c55e;
-        }}
+        }
         
-        .stat .vote-count.most-voted {{
+        .stat .vote-count.most-voted {
             color: #fbbf24;
-        }}
+        }
         
-        .stat .vote-count.few-voted {{
+        .stat .vote-count.few-voted {
             color: #ef4444;
-        }}
+        }
+        
+        .vote-tally {
+            margin-bottom: 15px;
+            font-size: 13px;
+            color: #9CA3AF;
+        }
+        
+        .tally-row {
+            display: grid;
+            grid-template-columns: minmax(80px, 160px) 1fr auto;
+            gap: 10px;
+            align-items: center;
+            margin-bottom: 6px;
+        }
+        
+        .tally-choice {
+            color: #F8F6FF;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+        
+        .tally-bar {
+            height: 8px;
+            background: rgba(156, 163, 175, 0.2);
+            border-radius: 4px;
+            overflow: hidden;
+        }
         
-        .non-voters {{
+        .tally-bar span {
+            display: block;
+            height: 100%;
+            background: #9CA3AF;
+        }
+        
+        .non-voters {
             background: rgba(156, 163, 175, 0.1);
             padding: 15px;
             border-radius: 8px;
             margin-top: 15px;
             border: 1px solid #9CA3AF;
-        }}
+        }
         
-        .non-voters-title {{
+        .non-voters-title {
             font-weight: 600;
             margin-bottom: 12px;
             color: #ef4444;
             font-size: 14px;
-        }}
+        }
         
-        .no-alerts {{
+        .participation-section {
+            margin-top: 30px;
+            overflow-x: auto;
+        }
+        
+        .participation-table {
+            border-collapse: collapse;
+            font-size: 13px;
+            color: #9CA3AF;
+        }
+        
+        .participation-table th,
+        .participation-table td {
+            padding: 6px 12px;
+            border: 1px solid rgba(156, 163, 175, 0.3);
+            text-align: center;
+            font-weight: 500;
+        }
+        
+        .participation-table td.member {
+            text-align: left;
+            color: #F8F6FF;
+        }
+        
+        .participation-table td.voted {
+            color: #22c55e;
+        }
+        
+        .participation-table td.missing {
+            color: #ef4444;
+        }
+        
+        .no-alerts {
             text-align: center;
             padding: 50px;
             color: #22c55e;
             font-size: 1.2rem;
-        }}
+        }
         
-        .footer {{
+        .footer {
             padding: 20px 30px;
             background: #0C0A1D;
             color: #9CA3AF;
             font-size: 14px;
             margin-top: 0;
             border-top: 1px solid #9CA3AF;
-        }}
+        }
         
-        .footer-content {{
+        .footer-content {
             max-width: 1140px;
             margin: 0 auto;
-        }}
+        }
         
-        .footer-top {{
+        .footer-top {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 12px;
             flex-wrap: wrap;
             gap: 10px;
-        }}
+        }
         
-        .footer-left {{
+        .footer-left {
             text-align: left;
             flex: 0 0 auto;
-        }}
+        }
         
-        .footer-right {{
+        .footer-right {
             text-align: right;
             flex: 0 0 auto;
-        }}
+        }
         
-        .footer a {{
+        .footer a {
             color: #9CA3AF;
             text-decoration: none;
             transition: color 0.3s ease;
-        }}
+        }
         
-        .footer a:hover {{
+        .footer a:hover {
             color: #F8F6FF;
             text-decoration: underline;
-        }}
+        }
         
-        .version {{
+        .version {
             font-weight: 600;
             color: #9CA3AF;
-        }}
+        }
         
-        .footer-separator {{
+        .footer-separator {
             color: #9CA3AF;
-        }}
+        }
         
-        .github-icon {{
+        .github-icon {
             display: inline-block;
             width: 16px;
             height: 16px;
             vertical-align: middle;
             margin-right: 5px;
-        }}
+        }
         
-        .snapshot-link {{
+        .snapshot-link {
             color: #9CA3AF;
             text-decoration: none;
             transition: color 0.3s ease;
-        }}
+        }
         
-        .snapshot-link:hover {{
+        .snapshot-link:hover {
             color: #F8F6FF;
             text-decoration: underline;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .footer-top {{
+        @media (max-width: 768px) {
+            .footer-top {
                 flex-direction: column;
                 align-items: flex-start;
                 gap: 12px;
-            }}
+            }
             
             .footer-left,
-            .footer-right {{
+            .footer-right {
                 text-align: left;
                 width: 100%;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
-<body>
+""").substitute(font_tags=font_head_html(ASSET_MANIFEST))
+
+REPORT_HEADER_TEMPLATE = Template("""<body>
     <div class="container">
         <div class="header">
             <h1>🗳️ The Graph Council Voting Monitor</h1>
-            <p><a href="https://snapshot.org/#/s:{SNAPSHOT_SPACE}" target="_blank" class="header-link">Tracking voting activity for The Graph Council</a></p>
-            <p>Last updated: {timestamp}</p>
+            <p>$header_links</p>
+            <p>Last updated: $timestamp</p>
         </div>
         
         <div class="content">
-"""
-    
-    # Filter proposals based on SHOW_COMPLETED_PROPOSALS setting
-    proposals_to_display = data['proposals']
-    if not SHOW_COMPLETED_PROPOSALS:
-        # Hide proposals where all council members have voted
-        proposals_to_display = [
-            p for p in data['proposals'] 
-            if p['council_votes'] < COUNCIL_MEMBERS_COUNT
-        ]
-    
-    html += f"""
+""")
+
+HEADER_LINK_TEMPLATE = Template(
+    '<a href="https://snapshot.org/#/s:$space" target="_blank" class="header-link">$label</a>'
+)
+
+SUMMARY_TEMPLATE = Template("""
             <div class="summary">
                 <div class="summary-card alert-count">
                     <h3>Active Alerts</h3>
-                    <div class="value">{data['summary']['total_alerts']}</div>
+                    <div class="value">$total_alerts</div>
                 </div>
                 <div class="summary-card proposal-count">
                     <h3>Active Proposals</h3>
-                    <div class="value">{len(proposals_to_display)}</div>
+                    <div class="value">$total_proposals</div>
                 </div>
                 <div class="summary-card member-count">
                     <h3>Council Members</h3>
-                    <div class="value">{COUNCIL_MEMBERS_COUNT}</div>
+                    <div class="value">$members_count</div>
                 </div>
             </div>
-"""
-    
-    # Proposals section (with alerts inline)
-    if proposals_to_display:
-        
-        html += """
+""")
+
+PROPOSALS_SECTION_START = """
             <div class="proposals-section">
                 <h2 class="section-title">Active Alerts</h2>
 """
-        
-        for proposal in proposals_to_display:
-            badge_class = "old" if proposal['days_old'] >= ALERT_THRESHOLD_DAYS else ""
-            has_alerts = len(proposal.get('alerts', [])) > 0
-            
-            # Calculate voting percentage and determine color class
-            council_votes = proposal['council_votes']
-            vote_percentage = (council_votes / COUNCIL_MEMBERS_COUNT * 100) if COUNCIL_MEMBERS_COUNT > 0 else 0
-            
-            if council_votes == COUNCIL_MEMBERS_COUNT:
-                vote_class = "all-voted"  # Green - all votes in
-            elif vote_percentage >= 50:
-                vote_class = "most-voted"  # Yellow - 50% or more but not all
-            else:
-                vote_class = "few-voted"  # Red - less than 50%
-            
-            # Determine days left badge color
-            days_left = proposal.get('days_left', 0)
-            
-            # Green ONLY when all council members have voted
-            if council_votes == COUNCIL_MEMBERS_COUNT:
-                days_left_class = ""  # Green - all voted (success)
-            # Red when less than 2 days and not all voted (urgent)
-            elif days_left < 2:
-                days_left_class = "urgent"  # Red - urgent, not all voted
-            # Yellow for all other cases when not all voted
-            else:
-                days_left_class = "soon"  # Yellow - not all voted yet
-            
-            days_left_text = f"{days_left} day{'s' if days_left != 1 else ''} left" if days_left >= 0 else "Ended"
-            
-            html += f"""
+
+PROPOSALS_SECTION_END = """
+            </div>
+"""
+
+PROPOSAL_CARD_TEMPLATE = Template("""
                 <div class="proposal-card">
                     <div class="proposal-header">
-                        <div class="proposal-title">{proposal['title']}</div>
+                        <div class="proposal-title">$title</div>
                         <div>
-                            <span class="proposal-badge {badge_class}">{proposal['days_old']} days old</span>
-                            <span class="days-left-badge {days_left_class}">{days_left_text}</span>
+                            <span class="proposal-badge $badge_class">$days_old days old</span>
+                            <span class="days-left-badge $days_left_class">$days_left_text</span>
                         </div>
                     </div>
                     <div class="proposal-stats">
                         <div class="stat">
-                            <strong>Total Votes:</strong> {proposal['total_votes']}
+                            <strong>Total Votes:</strong> $total_votes
                         </div>
                         <div class="stat">
-                            <strong>Council Votes:</strong> <span class="vote-count {vote_class}">{council_votes}/{COUNCIL_MEMBERS_COUNT}</span>
+                            <strong>Council Votes:</strong> <span class="vote-count $vote_class">$council_votes/$council_size</span>
                         </div>
                     </div>
+""")
+
+TALLY_START = """
+                    <div class="vote-tally">
 """
-            
-            # Show alerts for this proposal if any
-            if has_alerts and proposal['days_old'] >= ALERT_THRESHOLD_DAYS:
-                html += f"""
+
+TALLY_ROW_TEMPLATE = Template("""                        <div class="tally-row">
+                            <span class="tally-choice">$choice</span>
+                            <span class="tally-bar"><span style="width: $share%"></span></span>
+                            <span class="tally-value">$share% · $vp VP · $votes</span>
+                        </div>
+""")
+
+TALLY_END = """                    </div>
+"""
+
+PROPOSAL_ALERTS_START_TEMPLATE = Template("""
                     <div class="proposal-alerts">
                         <div class="alert-box warning">
                             <div class="alert-title">
-                                ⚠️ {len(proposal['alerts'])} Council Member(s) Haven't Voted (Proposal is {proposal['days_old']} days old)
+                                ⚠️ $alert_count Council Member(s) Haven't Voted (Proposal is $days_old days old)
                             </div>
-"""
-                
-                for wallet in proposal['council_non_voters']:
-                    wallet_display = data.get('wallet_names', {}).get(wallet, wallet)
-                    html += f"""
+""")
+
+ALERT_WALLET_TEMPLATE = Template("""
                             <div class="alert-details">
                                 <div class="wallet-address">
-                                    <span class="wallet-text">{wallet_display}</span>
-                                    <button class="copy-btn" onclick="copyToClipboard('{wallet}', this)">
+                                    <span class="wallet-text">$wallet_display</span>
+                                    <button class="copy-btn" onclick="copyToClipboard('$wallet', this)">
                                         Copy
                                     </button>
                                 </div>
                             </div>
-"""
-                
-                html += """
+""")
+
+PROPOSAL_ALERTS_END = """
                         </div>
                     </div>
 """
-            elif proposal['council_non_voters']:
-                # Show non-voters but without alert styling (under threshold)
-                html += f"""
+
+NON_VOTERS_START_TEMPLATE = Template("""
                     <div class="non-voters">
                         <div class="non-voters-title">
-                            Council Members Who Haven't Voted Yet ({len(proposal['council_non_voters'])}):
+                            Council Members Who Haven't Voted Yet ($count):
                         </div>
-"""
-                
-                for wallet in proposal['council_non_voters']:
-                    wallet_display = data.get('wallet_names', {}).get(wallet, wallet)
-                    html += f"""
+""")
+
+NON_VOTER_TEMPLATE = Template("""
                         <div class="wallet-address">
-                            <span class="wallet-text">{wallet_display}</span>
-                            <button class="copy-btn" onclick="copyToClipboard('{wallet}', this)">
+                            <span class="wallet-text">$wallet_display</span>
+                            <button class="copy-btn" onclick="copyToClipboard('$wallet', this)">
                                 Copy
                             </button>
                         </div>
-"""
-                
-                html += """
+""")
+
+NON_VOTERS_END = """
                     </div>
 """
-            
-            html += f"""
+
+PROPOSAL_CARD_END_TEMPLATE = Template("""
                     <div style="margin-top: 1rem;">
-                        <a href="https://snapshot.org/#/{SNAPSHOT_SPACE}/proposal/{proposal['id']}" 
+                        <a href="https://snapshot.org/#/$space/proposal/$proposal_id" 
                            class="snapshot-link" target="_blank">
                             View on Snapshot →
                         </a>
                     </div>
                 </div>
-"""
-        
-        html += """
+""")
+
+NO_PROPOSALS_HTML = """
+            <div class="no-alerts">
+                All clear! No recent proposals requiring attention.
             </div>
 """
-    else:
-        if FUN_MODE:
-            html += """
+
+NO_PROPOSALS_FUN_HTML = f"""
             <div class="no-alerts" style="padding: 50px;">
                 <div style="font-size: 1.5rem; margin-bottom: 20px;">Woohoo! Nothing to see here.</div>
-                <img src="./pedro.jpg" alt="Pedro approves!" style="max-width: 300px; border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.3);">
+                {picture_html(ASSET_MANIFEST, "pedro.jpg", "Pedro approves!", "300px", style=PEDRO_PICTURE_STYLE)}
             </div>
 """
-        else:
-            html += """
+
+ALL_VOTED_HTML = """
             <div class="no-alerts">
-                All clear! No recent proposals requiring attention.
+                Excellent! All council members are up to date with their votes.
             </div>
 """
-    
-    # Show success message if no alerts at all
-    if data['summary']['total_alerts'] == 0 and len(proposals_to_display) > 0:
-        if FUN_MODE:
-            html += """
+
+ALL_VOTED_FUN_HTML = f"""
             <div class="no-alerts" style="padding: 50px;">
-                <img src="./pedro.jpg" alt="Pedro approves!" style="max-width: 300px; border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.3); margin-bottom: 20px;">
+                {picture_html(ASSET_MANIFEST, "pedro.jpg", "Pedro approves!", "300px", style=PEDRO_PICTURE_STYLE + " margin-bottom: 20px;")}
                 <div style="font-size: 1.5rem; margin-top: 20px;">Amazing! The council is on fire! Everyone voted!</div>
             </div>
 """
-        else:
-            html += """
-            <div class="no-alerts">
-                Excellent! All council members are up to date with their votes.
+
+TABLE_START_TEMPLATE = Template("""
+            <div class="participation-section">
+                <h2 class="section-title">$heading</h2>
+                <table class="participation-table">
+                    <tr>
+                        <th>Member</th>
+""")
+
+TABLE_END = """                </table>
             </div>
 """
-    
-    html += f"""
+
+MATRIX_HEADER_CELL_TEMPLATE = Template("""                        <th title="$title">$label</th>
+""")
+
+MATRIX_HEADER_END = """                        <th>Voted</th>
+                    </tr>
+"""
+
+MATRIX_ROW_TEMPLATE = Template("""                    <tr>
+                        <td class="member">$wallet_display</td>$cells<td>$voted/$total</td>
+                    </tr>
+""")
+
+ANALYTICS_HEADER_END = """                        <th>Voted</th>
+                        <th>Participation</th>
+                        <th>Median Time to Vote</th>
+                        <th>Current Streak</th>
+                        <th>Longest Streak</th>
+                    </tr>
+"""
+
+ANALYTICS_ROW_TEMPLATE = Template("""                    <tr>
+                        <td class="member">$wallet_display</td><td>$voted/$total</td><td>$rate%</td><td>$median</td><td>$current_streak</td><td>$longest_streak</td>
+                    </tr>
+""")
+
+REPORT_FOOTER_TEMPLATE = Template("""
         </div>
         
         <div class="footer">
             <div class="footer-content">
                 <div class="footer-top">
                     <div class="footer-left">
-                        <a href="https://snapshot.org/#/s:{SNAPSHOT_SPACE}" target="_blank">Monitoring Snapshot votes for The Graph Council</a>
+                        <a href="https://snapshot.org/#/s:$space" target="_blank">Monitoring Snapshot votes for The Graph Council</a>
                     </div>
                     <div class="footer-right">
-                        <span class="version">v{VERSION}</span>
+                        <span class="version">v$version</span>
                         <span class="footer-separator">-</span>
                         <svg class="github-icon" viewBox="0 0 16 16" fill="currentColor"><path d="M8 0C3.58 0 0 3.58 0 8c0 3.54 2.29 6.53 5.47 7.59.4.07.55-.17.55-.38 0-.19-.01-.82-.01-1.49-2.01.37-2.53-.49-2.69-.94-.09-.23-.48-.94-.82-1.13-.28-.15-.68-.52-.01-.53.63-.01 1.08.58 1.23.82.72 1.21 1.87.87 2.33.66.07-.52.28-.87.51-1.07-1.78-.2-3.64-.89-3.64-3.95 0-.87.31-1.59.82-2.15-.08-.2-.36-1.02.08-2.12 0 0 .67-.21 2.2.82.64-.18 1.32-.27 2-.27.68 0 1.36.09 2 .27 1.53-1.04 2.2-.82 2.2-.82.44 1.1.16 1.92.08 2.12.51.56.82 1.27.82 2.15 0 3.07-1.87 3.75-3.65 3.95.29.25.54.73.54 1.48 0 1.07-.01 1.93-.01 2.2 0 .21.15.46.55.38A8.013 8.013 0 0016 8c0-4.42-3.58-8-8-8z"/></svg><a href="https://github.com/pdiomede/grump" target="_blank">View repo on GitHub</a>
                     </div>
@@ -879,27 +2217,299 @@ def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
     </div>
     
     <script>
-        function copyToClipboard(text, button) {{
-            navigator.clipboard.writeText(text).then(function() {{
+        function copyToClipboard(text, button) {
+            navigator.clipboard.writeText(text).then(function() {
                 const originalText = button.textContent;
                 button.textContent = 'Copied!';
                 button.classList.add('copied');
                 
-                setTimeout(function() {{
+                setTimeout(function() {
                     button.textContent = originalText;
                     button.classList.remove('copied');
-                }}, 2000);
-            }}, function(err) {{
+                }, 2000);
+            }, function(err) {
                 console.error('Failed to copy: ', err);
                 alert('Failed to copy to clipboard');
-            }});
-        }}
+            });
+        }
     </script>
 </body>
 </html>
-"""
+""")
+
+
+def render_proposal_card(proposal: Dict, wallet_names: Dict[str, str], members_count: int,
+                         space: str) -> str:
+    """Render one proposal card (stats, tally, alerts / non-voters and link)"""
+    badge_class = "old" if proposal['days_old'] >= ALERT_THRESHOLD_DAYS else ""
+    has_alerts = len(proposal.get('alerts', [])) > 0
+    
+    # Calculate voting percentage and determine color class
+    council_votes = proposal['council_votes']
+    council_size = proposal.get('council_members_count', members_count)
+    vote_percentage = (council_votes / council_size * 100) if council_size > 0 else 0
+    
+    if council_votes == council_size:
+        vote_class = "all-voted"  # Green - all votes in
+    elif vote_percentage >= 50:
+        vote_class = "most-voted"  # Yellow - 50% or more but not all
+    else:
+        vote_class = "few-voted"  # Red - less than 50%
+    
+    # Determine days left badge color
+    days_left = proposal.get('days_left', 0)
+    
+    # Green ONLY when all council members have voted
+    if council_votes == council_size:
+        days_left_class = ""  # Green - all voted (success)
+    # Red when less than 2 days and not all voted (urgent)
+    elif days_left < 2:
+        days_left_class = "urgent"  # Red - urgent, not all voted
+    # Yellow for all other cases when not all voted
+    else:
+        days_left_class = "soon"  # Yellow - not all voted yet
+    
+    days_left_text = f"{days_left} day{'s' if days_left != 1 else ''} left" if days_left >= 0 else "Ended"
+    
+    parts = [PROPOSAL_CARD_TEMPLATE.substitute(
+        title=escape(proposal['title']),
+        badge_class=badge_class,
+        days_old=proposal['days_old'],
+        days_left_class=days_left_class,
+        days_left_text=days_left_text,
+        total_votes=proposal['total_votes'],
+        vote_class=vote_class,
+        council_votes=council_votes,
+        council_size=council_size
+    )]
+    
+    # Per-choice voting power tally
+    if proposal.get('tally'):
+        parts.append(TALLY_START)
+        for entry in proposal['tally']:
+            parts.append(TALLY_ROW_TEMPLATE.substitute(
+                choice=escape(str(entry['choice'])),
+                share=f"{entry['share'] * 100:.1f}",
+                vp=format_voting_power(entry['vp']),
+                votes=f"{entry['votes']} vote{'s' if entry['votes'] != 1 else ''}"
+            ))
+        parts.append(TALLY_END)
+    
+    # Show alerts for this proposal if any
+    if has_alerts and proposal['days_old'] >= ALERT_THRESHOLD_DAYS:
+        parts.append(PROPOSAL_ALERTS_START_TEMPLATE.substitute(
+            alert_count=len(proposal['alerts']), days_old=proposal['days_old']
+        ))
+        for wallet in proposal['council_non_voters']:
+            parts.append(ALERT_WALLET_TEMPLATE.substitute(
+                wallet_display=escape(wallet_names.get(wallet, wallet)), wallet=escape(wallet)
+            ))
+        parts.append(PROPOSAL_ALERTS_END)
+    elif proposal['council_non_voters']:
+        # Show non-voters but without alert styling (under threshold)
+        parts.append(NON_VOTERS_START_TEMPLATE.substitute(count=len(proposal['council_non_voters'])))
+        for wallet in proposal['council_non_voters']:
+            parts.append(NON_VOTER_TEMPLATE.substitute(
+                wallet_display=escape(wallet_names.get(wallet, wallet)), wallet=escape(wallet)
+            ))
+        parts.append(NON_VOTERS_END)
+    
+    parts.append(PROPOSAL_CARD_END_TEMPLATE.substitute(
+        space=escape(proposal.get('space', space)), proposal_id=escape(proposal['id'])
+    ))
+    return "".join(parts)
+
+
+# Changing any card template invalidates every cached card fragment
+CARD_TEMPLATES_HASH = hashlib.sha256("".join([
+    PROPOSAL_CARD_TEMPLATE.template, TALLY_START, TALLY_ROW_TEMPLATE.template, TALLY_END,
+    PROPOSAL_ALERTS_START_TEMPLATE.template, ALERT_WALLET_TEMPLATE.template, PROPOSAL_ALERTS_END,
+    NON_VOTERS_START_TEMPLATE.template, NON_VOTER_TEMPLATE.template, NON_VOTERS_END,
+    PROPOSAL_CARD_END_TEMPLATE.template
+]).encode("utf-8")).hexdigest()
+
+_card_fragments: Dict[str, str] = {}
+
+
+def proposal_card_key(proposal: Dict, wallet_names: Dict[str, str], members_count: int,
+                      space: str) -> str:
+    """Hash everything a proposal card's markup depends on into a cache key
+    
+    The key changes whenever someone votes (vote counts, non-voter set), the
+    proposal ages a day (days old / left), or the alert threshold, member
+    names or card templates change.
+    """
+    inputs = {
+        "templates": CARD_TEMPLATES_HASH,
+        "alert_threshold": ALERT_THRESHOLD_DAYS,
+        "space": proposal.get('space', space),
+        "id": proposal['id'],
+        "title": proposal['title'],
+        "days_old": proposal['days_old'],
+        "days_left": proposal.get('days_left', 0),
+        "total_votes": proposal['total_votes'],
+        "council_votes": proposal['council_votes'],
+        "council_size": proposal.get('council_members_count', members_count),
+        "alerts": len(proposal.get('alerts', [])),
+        "non_voters": [(wallet, wallet_names.get(wallet, wallet)) for wallet in proposal['council_non_voters']],
+        "tally": proposal.get('tally')
+    }
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_cached_proposal_card(proposal: Dict, wallet_names: Dict[str, str], members_count: int,
+                                space: str) -> str:
+    """Return a proposal card, re-rendering it only if its inputs changed
+    
+    Fragments are memoized in memory (for watch mode and the webhook
+    receiver) and on disk under FRAGMENT_CACHE_DIR (for cron runs).
+    """
+    if not FRAGMENT_CACHE:
+        return render_proposal_card(proposal, wallet_names, members_count, space)
+    
+    key = proposal_card_key(proposal, wallet_names, members_count, space)
+    fragment = _card_fragments.get(key)
+    if fragment is not None:
+        record_cache("fragments", True)
+        return fragment
+    
+    cache_dir = Path(FRAGMENT_CACHE_DIR)
+    cache_file = cache_dir / f"{key}.html"
+    try:
+        fragment = cache_file.read_text(encoding="utf-8")
+        # Refresh the mtime so eviction drops the least recently used cards
+        os.utime(cache_file)
+        record_cache("fragments", True)
+    except OSError:
+        record_cache("fragments", False)
+        fragment = render_proposal_card(proposal, wallet_names, members_count, space)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_dir / f"{key}.{threading.get_ident()}.tmp"
+            tmp_file.write_text(fragment, encoding="utf-8")
+            os.replace(tmp_file, cache_file)
+            
+            entries = sorted(cache_dir.glob("*.html"), key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:max(len(entries) - FRAGMENT_CACHE_MAX_ENTRIES, 0)]:
+                entry.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Warning: could not write fragment cache: {e}")
     
-    return html
+    if len(_card_fragments) >= FRAGMENT_CACHE_MAX_ENTRIES:
+        _card_fragments.clear()
+    _card_fragments[key] = fragment
+    return fragment
+
+
+def render_html_report(data: Dict, council_wallets: List[str], sink: TextIO) -> None:
+    """Render the HTML report into a file-like ``sink``, one section at a time
+    
+    Only one section is held in memory at a time, so writing straight to the
+    output file keeps memory flat however many proposals or spaces there are.
+    """
+    timestamp = datetime.now(timezone.utc).strftime("%d %b %Y at %H:%M (UTC)")
+    space = data.get('space', SNAPSHOT_SPACE)
+    spaces = data.get('spaces', [space])
+    members_count = data.get('council_members_count', COUNCIL_MEMBERS_COUNT)
+    wallet_names = data.get('wallet_names', {})
+    
+    if len(spaces) == 1:
+        header_links = HEADER_LINK_TEMPLATE.substitute(
+            space=escape(space), label="Tracking voting activity for The Graph Council"
+        )
+    else:
+        header_links = "Tracking voting activity for " + " · ".join(
+            HEADER_LINK_TEMPLATE.substitute(space=escape(s), label=escape(s)) for s in spaces
+        )
+    
+    sink.write(REPORT_HEAD)
+    sink.write(REPORT_HEADER_TEMPLATE.substitute(header_links=header_links, timestamp=timestamp))
+    
+    # Filter proposals based on SHOW_COMPLETED_PROPOSALS setting
+    proposals_to_display = data['proposals']
+    if not SHOW_COMPLETED_PROPOSALS:
+        # Hide proposals where all council members have voted
+        proposals_to_display = [
+            p for p in data['proposals'] 
+            if p['council_votes'] < p.get('council_members_count', members_count)
+        ]
+    
+    sink.write(SUMMARY_TEMPLATE.substitute(
+        total_alerts=data['summary']['total_alerts'],
+        total_proposals=len(proposals_to_display),
+        members_count=members_count
+    ))
+    
+    # Proposals section (with alerts inline)
+    if proposals_to_display:
+        sink.write(PROPOSALS_SECTION_START)
+        for proposal in proposals_to_display:
+            sink.write(render_cached_proposal_card(proposal, wallet_names, members_count, space))
+        sink.write(PROPOSALS_SECTION_END)
+    else:
+        sink.write(NO_PROPOSALS_FUN_HTML if FUN_MODE else NO_PROPOSALS_HTML)
+    
+    # Show success message if no alerts at all
+    if data['summary']['total_alerts'] == 0 and len(proposals_to_display) > 0:
+        sink.write(ALL_VOTED_FUN_HTML if FUN_MODE else ALL_VOTED_HTML)
+    
+    # Council participation matrix (members x proposals), built from the bitmasks
+    if SHOW_PARTICIPATION_MATRIX:
+        titles = {p['id']: p['title'] for p in data['proposals']}
+        for matrix_space, matrix in data.get('participation', {}).items():
+            if not matrix['proposals']:
+                continue
+            heading = "Council Participation" if len(data.get('participation', {})) == 1 else f"Council Participation - {matrix_space}"
+            sink.write(TABLE_START_TEMPLATE.substitute(heading=escape(heading)))
+            for proposal_id in matrix['proposals']:
+                title = titles.get(proposal_id, proposal_id)
+                match = re.match(r'^(G[A-Z]P-\d+)', title, re.IGNORECASE)
+                label = match.group(1) if match else f"{proposal_id[:8]}…"
+                sink.write(MATRIX_HEADER_CELL_TEMPLATE.substitute(title=escape(title), label=escape(label)))
+            sink.write(MATRIX_HEADER_END)
+            total_proposals = len(matrix['proposals'])
+            for i, wallet in enumerate(matrix['members']):
+                cells = "".join(
+                    '<td class="voted">✓</td>' if (mask >> i) & 1 else '<td class="missing">–</td>'
+                    for mask in matrix['masks']
+                )
+                sink.write(MATRIX_ROW_TEMPLATE.substitute(
+                    wallet_display=escape(wallet_names.get(wallet, wallet)),
+                    cells=cells,
+                    voted=matrix['member_totals'][i],
+                    total=total_proposals
+                ))
+            sink.write(TABLE_END)
+    
+    # Long-term participation analytics from the vote archive
+    for analytics_space, members in data.get('analytics', {}).items():
+        if not members or not members[0]['proposals']:
+            continue
+        heading = "Council Participation History" if len(data.get('analytics', {})) == 1 else f"Council Participation History - {analytics_space}"
+        sink.write(TABLE_START_TEMPLATE.substitute(heading=escape(heading)))
+        sink.write(ANALYTICS_HEADER_END)
+        for member in members:
+            median = f"{member['median_hours_to_vote']:.1f}h" if member['median_hours_to_vote'] is not None else "–"
+            sink.write(ANALYTICS_ROW_TEMPLATE.substitute(
+                wallet_display=escape(wallet_names.get(member['wallet'], member['wallet'])),
+                voted=member['voted'],
+                total=member['proposals'],
+                rate=f"{member['participation_rate'] * 100:.0f}",
+                median=median,
+                current_streak=member['current_streak'],
+                longest_streak=member['longest_streak']
+            ))
+        sink.write(TABLE_END)
+    
+    sink.write(REPORT_FOOTER_TEMPLATE.substitute(space=escape(space), version=VERSION))
+
+
+def generate_html_report(data: Dict, council_wallets: List[str]) -> str:
+    """Generate HTML report with voting status"""
+    buffer = io.StringIO()
+    render_html_report(data, council_wallets, buffer)
+    return buffer.getvalue()
 
 
 def format_proposal_title(title: str) -> str:
@@ -919,130 +2529,747 @@ def format_proposal_title(title: str) -> str:
         return f'"{title}"'
 
 
+def format_voting_power(vp: float) -> str:
+    """Format voting power compactly, e.g. 1234567 -> 1.23M"""
+    for divisor, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(vp) >= divisor:
+            return f"{vp / divisor:.2f}{suffix}"
+    return f"{vp:.2f}".rstrip("0").rstrip(".")
+
+
+def slack_mentions() -> str:
+    """Return the Slack mention string for SLACK_MENTION_USERS (empty if none)"""
+    user_ids = [uid.strip() for uid in SLACK_MENTION_USERS.split(',') if uid.strip()]
+    return ' '.join([f"<@{uid}>" for uid in user_ids])
+
+
+def proposal_alert_details(proposal: Dict, data: Dict) -> tuple[int, str, List[str], str]:
+    """Return (missing votes, days left text, non-voter names, Snapshot link) for a proposal"""
+    # Calculate missing votes
+    council_size = proposal.get('council_members_count', data.get('council_members_count', COUNCIL_MEMBERS_COUNT))
+    missing_votes = council_size - proposal['council_votes']
+    
+    # Calculate days left (could be negative if ended)
+    days_left = proposal['days_left']
+    days_left_text = f"{days_left} day{'s' if days_left != 1 else ''}" if days_left >= 0 else "0 days (ENDED)"
+    
+    # Show names instead of addresses
+    wallet_names = data.get('wallet_names', {})
+    non_voters = [wallet_names.get(wallet, wallet) for wallet in proposal['council_non_voters']]
+    
+    proposal_link = f"https://snapshot.org/#/{proposal.get('space', SNAPSHOT_SPACE)}/proposal/{proposal['id']}"
+    return missing_votes, days_left_text, non_voters, proposal_link
+
+
+def format_tally_text(tally: List[Dict]) -> str:
+    """One-line voting power tally, e.g. 'For 60.0% (1.20M VP) · Against 40.0% (800K VP)'"""
+    return " · ".join(
+        f"{entry['choice']} {entry['share'] * 100:.1f}% ({format_voting_power(entry['vp'])} VP)"
+        for entry in tally
+    )
+
+
+def build_slack_message(proposal: Dict, data: Dict) -> str:
+    """Build the plain-text Slack reminder for one proposal"""
+    formatted_title = format_proposal_title(proposal['title'])
+    missing_votes, days_left_text, non_voters, proposal_link = proposal_alert_details(proposal, data)
+    
+    # Build the message
+    if alert_tier(proposal) == "urgent":
+        message_text = "⏰ URGENT - the deadline is close!\n"
+    else:
+        message_text = ""
+    if FUN_MODE:
+        message_text += f"🚨 Hey team! {formatted_title} needs some love! {missing_votes} vote{'s' if missing_votes != 1 else ''} missing and it's ending in {days_left_text}! ⏰\n"
+        message_text += f"Who forgot to vote in the last {ALERT_THRESHOLD_DAYS} days? 👀\n"
+    else:
+        message_text += f"🤖 Reminder: {formatted_title} has {missing_votes} missing vote{'s' if missing_votes != 1 else ''}, and is ending in {days_left_text}.\n"
+        message_text += f"Missing votes in the last {ALERT_THRESHOLD_DAYS} days:\n"
+    
+    # Add non-voters
+    for name in non_voters:
+        message_text += f"{name}\n"
+    
+    # Add the current voting power tally
+    if proposal.get('tally'):
+        message_text += f"\nCurrent tally: {format_tally_text(proposal['tally'])}\n"
+    
+    # Add link to proposal
+    if FUN_MODE:
+        message_text += f"\n🎯 Cast your vote NOW and be a hero: {proposal_link}\n"
+        message_text += "Let's gooooo! 🚀"
+    else:
+        message_text += f"\nPlease cast your vote here asap: {proposal_link}\n"
+        message_text += "Thank you!"
+    
+    # Add dashboard link
+    message_text += f"\n\nFull Details here:\n{DASHBOARD_URL}"
+    
+    # Add user mentions if configured
+    mentions = slack_mentions()
+    if mentions:
+        message_text += f"\n\ncc {mentions}"
+    
+    return message_text
+
+
+def slack_escape(text: str) -> str:
+    """Escape the characters Slack treats as markup in mrkdwn text"""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def build_slack_digest(proposals: List[Dict], data: Dict) -> List[Dict]:
+    """Build Block Kit digest payload(s) covering every proposal with alerts
+    
+    Everything goes into a single message unless Slack's limits (50 blocks,
+    3000 characters per section, overall message size) force a split.
+    
+    Returns:
+        list: webhook payloads, normally exactly one
+    """
+    count = len(proposals)
+    if FUN_MODE:
+        heading = f"🚨 Hey team! {count} proposal{'s' if count != 1 else ''} need{'s' if count == 1 else ''} some love!"
+    else:
+        heading = f"🤖 Reminder: {count} proposal{'s' if count != 1 else ''} with missing council votes"
+    footer = f"<{DASHBOARD_URL}|Full details on the dashboard>"
+    mentions = slack_mentions()
+    if mentions:
+        footer += f" · cc {mentions}"
+    
+    header_block = {"type": "header", "text": {"type": "plain_text", "text": heading[:SLACK_MAX_HEADER_CHARS], "emoji": True}}
+    footer_block = {"type": "context", "elements": [{"type": "mrkdwn", "text": footer}]}
+    
+    sections = []
+    for proposal in proposals:
+        missing_votes, days_left_text, non_voters, proposal_link = proposal_alert_details(proposal, data)
+        urgent = "⏰ *Ends soon* · " if alert_tier(proposal) == "urgent" else ""
+        text = (
+            f"{urgent}*<{proposal_link}|{slack_escape(format_proposal_title(proposal['title']))}>*\n"
+            f"{missing_votes} missing vote{'s' if missing_votes != 1 else ''} · ends in {days_left_text}\n"
+            f"Missing: {slack_escape(', '.join(non_voters))}"
+        )
+        if proposal.get('tally'):
+            text += f"\nTally: {slack_escape(format_tally_text(proposal['tally']))}"
+        if len(text) > SLACK_MAX_SECTION_CHARS:
+            text = text[:SLACK_MAX_SECTION_CHARS - 1] + "…"
+        sections.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
+    
+    def make_payload(blocks: List[Dict], part: int) -> Dict:
+        fallback = heading if part == 0 else f"{heading} (continued)"
+        return {
+            "text": fallback,
+            "blocks": [header_block, *blocks, footer_block],
+            "unfurl_links": False,
+            "unfurl_media": False
+        }
+    
+    payloads = []
+    blocks = []
+    for section in sections:
+        candidate = blocks + ([{"type": "divider"}] if blocks else []) + [section]
+        too_many_blocks = len(candidate) + 2 > SLACK_MAX_BLOCKS
+        too_large = len(json.dumps(make_payload(candidate, len(payloads)))) > SLACK_MAX_MESSAGE_BYTES
+        if blocks and (too_many_blocks or too_large):
+            payloads.append(make_payload(blocks, len(payloads)))
+            candidate = [section]
+        blocks = candidate
+    payloads.append(make_payload(blocks, len(payloads)))
+    return payloads
+
+
+def digest_text(payload: Dict) -> str:
+    """Plain-text rendering of a digest payload (for the non-Slack channels)"""
+    lines = []
+    for block in payload["blocks"]:
+        if block["type"] in ("header", "section"):
+            lines.append(block["text"]["text"])
+        elif block["type"] == "context":
+            lines.extend(element["text"] for element in block["elements"])
+    return "\n\n".join(lines)
+
+
+def build_notifiers() -> Dict[str, Notifier]:
+    """Create the notification backends listed in NOTIFY_CHANNELS
+    
+    Each backend gets its own HTTP session, rate limit and timeout. Channels
+    that are not configured are skipped with a warning.
+    """
+    retries = {"max_retries": HTTP_MAX_RETRIES, "backoff_base": HTTP_BACKOFF_BASE}
+    notifiers = {}
+    for channel in NOTIFY_CHANNELS:
+        if channel == "slack":
+            if not SLACK_WEBHOOK_URL:
+                print("\n⚠️  Slack webhook URL not configured - skipping Slack notification")
+                continue
+            notifiers[channel] = create_notifier("slack", webhook_url=SLACK_WEBHOOK_URL, timeout=SLACK_TIMEOUT,
+                                                 rate_limit=SLACK_RATE_LIMIT, **retries)
+        elif channel == "telegram":
+            if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+                print("\n⚠️  TELEGRAM_BOT_TOKEN / TELEGRAM_CHAT_ID not configured - skipping Telegram notification")
+                continue
+            notifiers[channel] = create_notifier("telegram", bot_token=TELEGRAM_BOT_TOKEN, chat_id=TELEGRAM_CHAT_ID,
+                                                 timeout=TELEGRAM_TIMEOUT, rate_limit=TELEGRAM_RATE_LIMIT, **retries)
+        elif channel == "webhook":
+            if not NOTIFY_WEBHOOK_URL:
+                print("\n⚠️  NOTIFY_WEBHOOK_URL not configured - skipping webhook notification")
+                continue
+            notifiers[channel] = create_notifier("webhook", url=NOTIFY_WEBHOOK_URL, timeout=NOTIFY_WEBHOOK_TIMEOUT,
+                                                 rate_limit=NOTIFY_WEBHOOK_RATE_LIMIT, **retries)
+        elif channel == "file":
+            notifiers[channel] = create_notifier("file", path=SLACK_MESSAGE_FILE, max_bytes=SLACK_MESSAGE_MAX_BYTES,
+                                                 backups=SLACK_MESSAGE_BACKUPS)
+        else:
+            print(f"\n⚠️  Unknown notification channel '{channel}' in NOTIFY_CHANNELS - ignoring")
+    return notifiers
+
+
+def get_notifiers() -> Dict[str, Notifier]:
+    """Return the configured notification backends (created once per process)"""
+    global _notifiers
+    with _notifiers_lock:
+        if _notifiers is None:
+            _notifiers = build_notifiers()
+        return _notifiers
+
+
+def enqueue_notifications(conn: sqlite3.Connection, messages: List[Dict], channels: List[str]) -> None:
+    """Add messages to the outbox (once per channel) and wake the delivery worker"""
+    now = int(time.time())
+    conn.executemany(
+        "INSERT INTO outbox (channel, label, payload, created, next_attempt) VALUES (?, ?, ?, ?, ?)",
+        [(channel, message["label"], json.dumps(message), now, now) for message in messages for channel in channels]
+    )
+    conn.commit()
+    _outbox_idle.clear()
+    _outbox_wakeup.set()
+
+
+def outbox_pending(conn: sqlite3.Connection) -> tuple[int, int]:
+    """Return (number of undelivered messages still being retried, earliest retry time)"""
+    count, next_attempt = conn.execute(
+        "SELECT COUNT(*), MIN(MAX(next_attempt, leased_until)) FROM outbox "
+        "WHERE delivered IS NULL AND attempts < ?",
+        (OUTBOX_MAX_ATTEMPTS,)
+    ).fetchone()
+    return count, next_attempt
+
+
+def deliver_outbox(conn: sqlite3.Connection, force: bool = False) -> int:
+    """Deliver every outbox message that is due
+    
+    A failed message is retried (on its channel only) after
+    OUTBOX_BACKOFF_BASE seconds, doubling with each attempt (up to an hour),
+    and given up on after OUTBOX_MAX_ATTEMPTS. Each message is leased before
+    it is sent, so two processes draining the same outbox do not deliver it
+    twice.
+    
+    Args:
+        conn: State store connection
+        force: Also retry messages that are still backing off (messages
+            leased by another process are still left to it)
+    
+    Returns:
+        int: number of messages delivered
+    """
+    now = int(time.time())
+    conn.execute(
+        "DELETE FROM outbox WHERE created < ? AND (delivered IS NOT NULL OR attempts >= ?)",
+        (now - OUTBOX_RETENTION_DAYS * 86400, OUTBOX_MAX_ATTEMPTS)
+    )
+    if force:
+        # Only the backoff is skipped; a message being sent right now keeps its lease
+        conn.execute(
+            "UPDATE outbox SET next_attempt = ? WHERE delivered IS NULL AND attempts < ? AND leased_until <= ?",
+            (now, OUTBOX_MAX_ATTEMPTS, now)
+        )
+    conn.commit()
+    rows = conn.execute(
+        "SELECT id, channel, label, payload, attempts, leased_until FROM outbox "
+        "WHERE delivered IS NULL AND attempts < ? AND next_attempt <= ? AND leased_until <= ? ORDER BY id",
+        (OUTBOX_MAX_ATTEMPTS, now, now)
+    ).fetchall()
+    
+    claimed = []
+    for row in rows:
+        if conn.execute(
+            "UPDATE outbox SET leased_until = ? WHERE id = ? AND leased_until = ? AND delivered IS NULL",
+            (int(time.time()) + OUTBOX_LEASE_SECONDS, row[0], row[5])
+        ).rowcount:
+            claimed.append(row)
+    conn.commit()
+    if not claimed:
+        return 0
+    
+    # Send everything at once: each channel works through its own messages
+    # concurrently with the others, within its own timeout
+    notifiers = get_notifiers()
+    results = iter(send_all([(notifiers[channel], json.loads(payload))
+                             for _, channel, _, payload, _, _ in claimed if channel in notifiers]))
+    
+    delivered = 0
+    for message_id, channel, label, _, attempts, _ in claimed:
+        error = next(results) if channel in notifiers else NotifierError(f"channel '{channel}' is not configured")
+        attempts += 1
+        if error:
+            delay = min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX)
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ?, leased_until = 0 WHERE id = ?",
+                (attempts, int(time.time() + delay), str(error)[:500], message_id)
+            )
+            METRICS.increment("notifications", channel=channel, result="failed")
+            if attempts >= OUTBOX_MAX_ATTEMPTS:
+                print(f"  ✗ Giving up on {channel} notification for: {label} after {attempts} attempts ({error})")
+            else:
+                print(f"  ✗ Failed to deliver {channel} notification for: {label} ({error}) - retrying in {delay:.0f}s")
+        else:
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, delivered = ?, last_error = NULL, leased_until = 0 WHERE id = ?",
+                (attempts, int(time.time()), message_id)
+            )
+            delivered += 1
+            METRICS.increment("notifications", channel=channel, result="delivered")
+            print(f"  ✓ {'Saved' if channel == 'file' else 'Sent'} {channel} notification for: {label}")
+    conn.commit()
+    return delivered
+
+
+def outbox_worker() -> None:
+    """Background thread: deliver outbox messages as they are queued or come due"""
+    conn = open_state_db()
+    while True:
+        _outbox_wakeup.clear()
+        next_attempt = None
+        try:
+            deliver_outbox(conn)
+            _, next_attempt = outbox_pending(conn)
+        except sqlite3.Error as e:
+            print(f"✗ Outbox delivery failed: {e}")
+        if not _outbox_wakeup.is_set():
+            _outbox_idle.set()
+        _outbox_wakeup.wait(None if next_attempt is None else max(next_attempt - time.time(), 1))
+
+
+def start_outbox_worker() -> None:
+    """Start the background delivery worker (once per process)"""
+    global _outbox_worker
+    with _outbox_worker_lock:
+        if _outbox_worker is None:
+            _outbox_idle.clear()
+            _outbox_worker = threading.Thread(target=outbox_worker, name="outbox", daemon=True)
+            _outbox_worker.start()
+
+
+def finish_outbox(timeout: float = OUTBOX_DRAIN_TIMEOUT) -> None:
+    """Wait (up to ``timeout`` seconds) for the worker to deliver the messages
+    that are due, before a one-shot run exits"""
+    if _outbox_worker is None:
+        return
+    _outbox_idle.wait(timeout)
+    conn = open_state_db()
+    try:
+        pending, _ = outbox_pending(conn)
+    finally:
+        conn.close()
+    if pending:
+        print(f"\n📬 {pending} notification(s) left in the outbox - they will be retried "
+              f"on the next run (or run with --deliver)")
+
+
+def alert_tier(proposal: Dict) -> str:
+    """Return the alert tier ("urgent" once the deadline is within
+    ALERT_ESCALATION_HOURS, otherwise "reminder")"""
+    hours_left = (proposal['end'] - datetime.now(timezone.utc).timestamp()) / 3600
+    return "urgent" if hours_left <= ALERT_ESCALATION_HOURS else "reminder"
+
+
+def alert_key(proposal: Dict) -> tuple[str, str, str]:
+    """Ledger key of a proposal's alert: (proposal id, non-voter set, tier)"""
+    return proposal['id'], ",".join(sorted(proposal['council_non_voters'])), alert_tier(proposal)
+
+
+def filter_due_alerts(conn: sqlite3.Connection, proposals: List[Dict]) -> List[Dict]:
+    """Keep the proposals whose alert is new or due again
+    
+    An alert is due when its (proposal, non-voter set, tier) key has never
+    been sent, or was last sent more than SLACK_RENOTIFY_HOURS ago. A vote
+    (smaller non-voter set) or an escalation to "urgent" is a new key.
+    """
+    now = int(datetime.now(timezone.utc).timestamp())
+    renotify_after = SLACK_RENOTIFY_HOURS * 3600 - RENOTIFY_GRACE_SECONDS
+    due = []
+    for proposal in proposals:
+        row = conn.execute(
+            "SELECT last_sent FROM alert_ledger WHERE proposal_id = ? AND non_voters = ? AND tier = ?",
+            alert_key(proposal)
+        ).fetchone()
+        if row is None or now - row[0] >= renotify_after:
+            due.append(proposal)
+    return due
+
+
+def record_sent_alerts(conn: sqlite3.Connection, proposals: List[Dict]) -> None:
+    """Mark the alerts of ``proposals`` as sent now"""
+    now = int(datetime.now(timezone.utc).timestamp())
+    conn.executemany(
+        "INSERT INTO alert_ledger (proposal_id, non_voters, tier, last_sent) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(proposal_id, non_voters, tier) DO UPDATE SET last_sent = excluded.last_sent",
+        [(*alert_key(proposal), now) for proposal in proposals]
+    )
+    conn.commit()
+
+
 def send_slack_notification(data: Dict, council_wallets: List[str]) -> bool:
-    """Send Slack notifications for proposals with alerts"""
+    """Queue notifications for proposals with alerts on every NOTIFY_CHANNELS backend
+    
+    With SLACK_DIGEST=Y every proposal goes into one Block Kit message (one
+    HTTP call); otherwise one message is queued per proposal. Messages are
+    written to the outbox and delivered by a background worker, so a slow or
+    failing channel never holds up the monitor and no message is lost.
+    """
     # Filter proposals that have alerts (days_old >= threshold and has non-voters)
     proposals_with_alerts = [
         p for p in data['proposals'] 
         if p['days_old'] >= ALERT_THRESHOLD_DAYS and p['council_non_voters']
     ]
+    notifiers = get_notifiers()
+    if proposals_with_alerts and not notifiers:
+        print("\n⚠️  No notification channel configured - skipping notifications")
+        return False
     
-    if not proposals_with_alerts:
-        if POST_TO_SLACK:
-            print("\n✓ No alerts to send to Slack")
+    conn = open_state_db()
+    try:
+        # Skip alerts already sent within SLACK_RENOTIFY_HOURS
+        if ALERT_LEDGER and proposals_with_alerts:
+            due = filter_due_alerts(conn, proposals_with_alerts)
+            if len(due) < len(proposals_with_alerts):
+                print(f"\n🔕 {len(proposals_with_alerts) - len(due)} alert(s) already sent in the last "
+                      f"{SLACK_RENOTIFY_HOURS:g}h with no new votes - not sending again")
+            proposals_with_alerts = due
+        
+        if not proposals_with_alerts:
+            print("\n✓ No alerts to send")
+            return True
+        
+        if SLACK_DIGEST:
+            payloads = build_slack_digest(proposals_with_alerts, data)
+            messages = [{
+                "label": f"digest of {len(proposals_with_alerts)} proposal(s)"
+                         + (f" (part {part + 1}/{len(payloads)})" if len(payloads) > 1 else ""),
+                "text": digest_text(payload),
+                "slack": payload
+            } for part, payload in enumerate(payloads)]
         else:
-            print("\n✓ No alerts to save to file")
-        return True
-    
-    # Check if we should post to Slack or save to file
-    if POST_TO_SLACK:
-        if not SLACK_WEBHOOK_URL:
-            print("\n⚠️  Slack webhook URL not configured - skipping Slack notification")
-            return False
-        print(f"\n📤 Sending Slack notifications for {len(proposals_with_alerts)} proposal(s)...")
-    else:
-        print(f"\n💾 Saving Slack notifications to slack_message.txt for {len(proposals_with_alerts)} proposal(s)...")
+            messages = [{
+                "label": proposal['title'],
+                "text": build_slack_message(proposal, data)
+            } for proposal in proposals_with_alerts]
+        
+        enqueue_notifications(conn, messages, list(notifiers))
+        # A queued alert counts as sent: the outbox guarantees its delivery
+        if ALERT_LEDGER:
+            record_sent_alerts(conn, proposals_with_alerts)
+    finally:
+        conn.close()
     
-    success_count = 0
-    for proposal in proposals_with_alerts:
+    print(f"\n📬 Queued {len(messages)} notification(s) for {', '.join(notifiers)} "
+          f"covering {len(proposals_with_alerts)} proposal(s)")
+    start_outbox_worker()
+    return True
+
+
+def load_councils(space_configs: List[tuple[str, str]],
+                  exit_on_error: bool = True) -> List[tuple[str, List[str], Dict[str, str]]]:
+    """Load the council wallets of every configured space
+    
+    Args:
+        space_configs: (space, wallets file) pairs
+        exit_on_error: Exit if a wallets file is missing or unreadable;
+            otherwise the error is raised (watch mode retries next check)
+    
+    Returns:
+        list: (space, council wallets, wallet names) tuples
+    """
+    councils = []
+    for space, wallets_file in space_configs:
         try:
-            # Extract proposal identifier (try to find GGP-XXX pattern or use title)
-            title = proposal['title']
-            formatted_title = format_proposal_title(title)
-            proposal_id = proposal['id']
-            
-            # Calculate missing votes
-            missing_votes = COUNCIL_MEMBERS_COUNT - proposal['council_votes']
-            
-            # Calculate days left (could be negative if ended)
-            days_left = proposal['days_left']
-            days_left_text = f"{days_left} day{'s' if days_left != 1 else ''}" if days_left >= 0 else "0 days (ENDED)"
-            
-            # Build the message
-            if FUN_MODE:
-                message_text = f"🚨 Hey team! {formatted_title} needs some love! {missing_votes} vote{'s' if missing_votes != 1 else ''} missing and it's ending in {days_left_text}! ⏰\n"
-                message_text += f"Who forgot to vote in the last {ALERT_THRESHOLD_DAYS} days? 👀\n"
-            else:
-                message_text = f"🤖 Reminder: {formatted_title} has {missing_votes} missing vote{'s' if missing_votes != 1 else ''}, and is ending in {days_left_text}.\n"
-                message_text += f"Missing votes in the last {ALERT_THRESHOLD_DAYS} days:\n"
-            
-            # Add non-voters (show names instead of addresses)
-            wallet_names = data.get('wallet_names', {})
-            for wallet in proposal['council_non_voters']:
-                wallet_display = wallet_names.get(wallet, wallet)
-                message_text += f"{wallet_display}\n"
-            
-            # Add link to proposal
-            proposal_link = f"https://snapshot.org/#/{SNAPSHOT_SPACE}/proposal/{proposal_id}"
-            if FUN_MODE:
-                message_text += f"\n🎯 Cast your vote NOW and be a hero: {proposal_link}\n"
-                message_text += "Let's gooooo! 🚀"
-            else:
-                message_text += f"\nPlease cast your vote here asap: {proposal_link}\n"
-                message_text += "Thank you!"
-            
-            # Add dashboard link
-            message_text += "\n\nFull Details here:\nhttps://dashboards.thegraph.foundation/grump/"
-            
-            # Add user mentions if configured
-            if SLACK_MENTION_USERS:
-                user_ids = [uid.strip() for uid in SLACK_MENTION_USERS.split(',') if uid.strip()]
-                if user_ids:
-                    mentions = ' '.join([f"<@{uid}>" for uid in user_ids])
-                    message_text += f"\n\ncc {mentions}"
-            
-            # Send to Slack or save to file
-            if POST_TO_SLACK:
-                # Send to Slack
-                payload = {
-                    "text": message_text,
-                    "unfurl_links": False,
-                    "unfurl_media": False
-                }
-                
-                response = requests.post(
-                    SLACK_WEBHOOK_URL,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    print(f"  ✓ Sent notification for: {title}")
-                    success_count += 1
-                else:
-                    print(f"  ✗ Failed to send notification for: {title} (Status: {response.status_code})")
-            else:
-                # Save to file
-                try:
-                    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-                    with open("slack_message.txt", "a", encoding="utf-8") as f:
-                        f.write(f"\n{'='*80}\n")
-                        f.write(f"Timestamp: {timestamp}\n")
-                        f.write(f"{'='*80}\n")
-                        f.write(message_text)
-                        f.write(f"\n{'='*80}\n\n")
-                    print(f"  ✓ Saved notification for: {title}")
-                    success_count += 1
-                except IOError as e:
-                    print(f"  ✗ Failed to save notification for: {title} (Error: {e})")
-                
-        except requests.exceptions.RequestException as e:
-            if POST_TO_SLACK:
-                print(f"  ✗ Error sending Slack notification for {proposal.get('title', 'Unknown')}: {e}")
-        except Exception as e:
-            print(f"  ✗ Unexpected error for {proposal.get('title', 'Unknown')}: {e}")
+            space_wallets, wallet_names = load_council_wallets(wallets_file)
+        except OSError as e:
+            if not exit_on_error:
+                raise
+            print(f"Error: {e}")
+            sys.exit(1)
+        councils.append((space, space_wallets, wallet_names))
+        print(f"Loaded {len(space_wallets)} council member addresses for {space}")
+    return councils
+
+
+def analysis_fingerprint(reports: List[Dict]) -> str:
+    """Hash the analysis results, used to skip output when nothing changed"""
+    payload = json.dumps(reports, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def write_html_reports(reports: List[Dict], council_wallets: List[str]) -> None:
+    """Write the HTML report(s): one combined page, or one page per space"""
+    if len(reports) > 1 and MULTI_SPACE_REPORT == "per_space":
+        outputs = [(space_output_path(report["space"]), report) for report in reports]
+    else:
+        outputs = [(OUTPUT_HTML, merge_space_reports(reports))]
+    
+    for output_path, report in outputs:
+        print(f"\nGenerating HTML report: {output_path}")
+        # The page is only re-rendered and rewritten when its inputs changed,
+        # so an unchanged report keeps its mtime / ETag
+        fingerprint = analysis_fingerprint([
+            report, VERSION, CARD_TEMPLATES_HASH, ASSET_MANIFEST, ALERT_THRESHOLD_DAYS,
+            FUN_MODE, SHOW_COMPLETED_PROPOSALS, SHOW_PARTICIPATION_MATRIX
+        ])
+        written = publish(
+            output_path,
+            lambda sink, report=report: render_html_report(report, council_wallets, sink),
+            fingerprint=fingerprint
+        )
+        
+        if written:
+            print(f"✓ Report generated successfully!")
+            print(f"✓ Open {output_path} in your browser to view the report")
+        else:
+            print(f"✓ {output_path} is already up to date")
+
+
+# Bump when a field is renamed or removed from report.json (adding fields is
+# backwards compatible)
+REPORT_SCHEMA_VERSION = 1
+
+
+def report_json_paths() -> tuple[Path, Path]:
+    """Return the report.json and report-delta.json paths (next to OUTPUT_HTML)"""
+    output_dir = Path(OUTPUT_HTML).parent
+    return output_dir / "report.json", output_dir / "report-delta.json"
+
+
+def build_report_json(data: Dict) -> Dict:
+    """Serialize an analysis into the versioned report.json document"""
+    wallet_names = data.get('wallet_names', {})
+    members_count = data.get('council_members_count', COUNCIL_MEMBERS_COUNT)
+    proposals = []
+    for proposal in data['proposals']:
+        entry = {
+            "id": proposal['id'],
+            "space": proposal.get('space', data.get('space', SNAPSHOT_SPACE)),
+            "title": proposal['title'],
+            "created": proposal['created'],
+            "end": proposal['end'],
+            "days_old": proposal['days_old'],
+            "days_left": proposal['days_left'],
+            "total_votes": proposal['total_votes'],
+            "council_votes": proposal['council_votes'],
+            "council_size": proposal.get('council_members_count', members_count),
+            "non_voters": [
+                {"wallet": wallet, "name": wallet_names.get(wallet)} for wallet in proposal['council_non_voters']
+            ],
+            "alert": bool(proposal['alerts'])
+        }
+        if proposal.get('tally') is not None:
+            entry["tally"] = proposal['tally']
+        proposals.append(entry)
+    
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "spaces": data.get('spaces', [data.get('space', SNAPSHOT_SPACE)]),
+        "council_members_count": members_count,
+        "alert_threshold_days": ALERT_THRESHOLD_DAYS,
+        "summary": data['summary'],
+        "proposals": proposals,
+        "alerts": [
+            {"wallet": alert['wallet'], "proposal_id": alert['proposal_id'], "days_old": alert['days_old']}
+            for alert in data['alerts']
+        ]
+    }
+
+
+def diff_report_json(previous: Dict, current: Dict) -> Dict:
+    """List the proposals added, removed and changed between two reports"""
+    before = {p['id']: p for p in previous.get('proposals', [])}
+    after = {p['id']: p for p in current['proposals']}
+    changed = []
+    for proposal_id in after.keys() & before.keys():
+        old, new = before[proposal_id], after[proposal_id]
+        fields = sorted(key for key in new.keys() | old.keys() if new.get(key) != old.get(key))
+        if not fields:
+            continue
+        old_non_voters = {v['wallet'] for v in old.get('non_voters', [])}
+        new_non_voters = {v['wallet'] for v in new['non_voters']}
+        changed.append({
+            "id": proposal_id,
+            "fields": fields,
+            "new_voters": sorted(old_non_voters - new_non_voters)
+        })
+    return {
+        "added": [proposal_id for proposal_id in after if proposal_id not in before],
+        "removed": [proposal_id for proposal_id in before if proposal_id not in after],
+        "changed": sorted(changed, key=lambda entry: entry['id']),
+        "summary": current['summary']
+    }
+
+
+def write_report_json(data: Dict) -> None:
+    """Publish report.json and report-delta.json next to the HTML report
+    
+    Both files are compact JSON. ``report_id`` identifies a report's content;
+    the delta lists what changed from the previously published report
+    (``from``) to the current one (``to``). Nothing is rewritten when the
+    analysis is unchanged.
+    """
+    report = build_report_json(data)
+    report_id = analysis_fingerprint([report])
+    report_path, delta_path = report_json_paths()
+    
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    if previous.get("report_id") == report_id:
+        return
+    
+    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    delta = {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "generated_at": generated_at,
+        "from": previous.get("report_id"),
+        "to": report_id,
+        **diff_report_json(previous, report)
+    }
+    document = {"report_id": report_id, "generated_at": generated_at, **report}
+    
+    # Delta first, so a consumer that sees the new report.json can fetch its delta
+    publish(delta_path, json.dumps(delta, separators=(",", ":")))
+    publish(report_path, json.dumps(document, separators=(",", ":")))
+    print(f"✓ Published {report_path} ({len(delta['added'])} added, {len(delta['changed'])} changed, "
+          f"{len(delta['removed'])} removed)")
+
+
+def run_monitor(councils: List[tuple[str, List[str], Dict[str, str]]],
+                previous_fingerprint: str = None) -> str:
+    """Fetch, analyze and publish once
     
-    if POST_TO_SLACK:
-        print(f"\n📊 Slack notifications: {success_count}/{len(proposals_with_alerts)} sent successfully")
+    Writes the HTML report(s), unless the analysis is identical to the one
+    identified by ``previous_fingerprint``, and sends Slack notifications.
+    With ALERT_LEDGER the alerts are checked on every run, since re-notify
+    and escalation depend on the time passed, not on the analysis changing.
+    
+    Returns:
+        str: fingerprint of this run's analysis
+    """
+    council_wallets = []
+    for _, space_wallets, _ in councils:
+        council_wallets.extend(w for w in space_wallets if w not in council_wallets)
+    
+    # Fetch and analyze data (all spaces concurrently)
+    print("\nFetching active proposals from Snapshot...")
+    with METRICS.stage("fetch_and_analyze"):
+        reports = asyncio.run(analyze_spaces_async(councils))
+    if ARCHIVE_ANALYTICS:
+        with METRICS.stage("archive_analytics"):
+            attach_archive_analytics(reports, councils)
+    data = merge_space_reports(reports)
+    METRICS.set("proposals", data['summary']['total_proposals'])
+    METRICS.set("alerts", data['summary']['total_alerts'])
+    
+    print(f"\nFound {data['summary']['total_proposals']} active proposal(s)")
+    print(f"Generated {data['summary']['total_alerts']} alert(s)")
+    
+    fingerprint = analysis_fingerprint(reports)
+    changed = fingerprint != previous_fingerprint
+    if changed:
+        with METRICS.stage("render"):
+            write_html_reports(reports, council_wallets)
+        if REPORT_JSON:
+            with METRICS.stage("report_json"):
+                write_report_json(data)
+    
+    # Send Slack notifications (the ledger decides which alerts are due again)
+    if changed or ALERT_LEDGER:
+        with METRICS.stage("notify"):
+            send_slack_notification(data, council_wallets)
+    
+    if not changed:
+        print("\n✓ No changes since the last check - report left untouched")
+        return fingerprint
+    
+    # Print summary to console
+    if data['alerts']:
+        print("\n⚠️  ALERTS:")
+        for alert in data['alerts']:
+            print(f"  • {alert['wallet'][:10]}... hasn't voted on '{alert['proposal_title']}' ({alert['days_old']} days)")
     else:
-        print(f"\n📊 File notifications: {success_count}/{len(proposals_with_alerts)} saved successfully")
+        print("\n✓ No alerts - all council members are up to date!")
+    
+    return fingerprint
+
+
+def write_metrics(success: bool) -> None:
+    """Write the run's metrics to METRICS_PROM_FILE and METRICS_JSON_FILE and
+    print where the time went"""
+    stages = METRICS.snapshot().get("stage_duration_seconds", [])
+    if stages:
+        print("\n⏱️  " + ", ".join(f"{stage['labels']['stage']} {stage['value']:.2f}s" for stage in stages))
+    write_run_metrics(METRICS_PROM_FILE, METRICS_JSON_FILE, success, info={"version": VERSION})
+
+
+def watch(space_configs: List[tuple[str, str]], interval: int) -> None:
+    """Run the monitor in a loop, keeping state in memory between checks
+    
+    Wallet files are re-read only when their modification time changes, HTTP
+    sessions stay open, and the report is only touched when the analysis
+    changes. A failed check (e.g. a wallets file that is missing for a
+    moment) is logged and retried at the next interval.
+    """
+    print(f"\n👀 Watch mode: checking every {interval} seconds (Ctrl+C to stop)")
+    councils = None
+    wallet_mtimes = None
+    last_fingerprint = None
     
-    return success_count == len(proposals_with_alerts)
+    while True:
+        try:
+            mtimes = [Path(wallets_file).stat().st_mtime if Path(wallets_file).exists() else None
+                      for _, wallets_file in space_configs]
+            if mtimes != wallet_mtimes:
+                print("\nLoading council member wallets...")
+                councils = load_councils(space_configs, exit_on_error=False)
+                wallet_mtimes = mtimes
+                last_fingerprint = None
+            
+            print(f"\n[{datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}] Checking Snapshot...")
+            METRICS.start()
+            last_fingerprint = run_monitor(councils, last_fingerprint)
+            write_metrics(True)
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            print(f"✗ Check failed: {e}")
+            write_metrics(False)
+        # Deliveries still running count towards the next check
+        METRICS.reset()
+        
+        time.sleep(interval)
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="The Graph Council Voting Monitor")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and check Snapshot every --interval seconds")
+    parser.add_argument("--interval", type=int, default=WATCH_INTERVAL_SECONDS,
+                        help=f"seconds between checks in watch mode (default: {WATCH_INTERVAL_SECONDS})")
+    parser.add_argument("--backfill", action="store_true",
+                        help=f"download every past proposal and council vote into {ARCHIVE_DB}, then exit")
+    parser.add_argument("--deliver", action="store_true",
+                        help="deliver the queued notifications in the outbox (retrying failed ones now), then exit")
+    args = parser.parse_args()
+    
     current_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
     
     print("=" * 60)
@@ -1051,47 +3278,60 @@ def main():
     print(f"Last Update: {LAST_UPDATE}")
     print(f"Current Run: {current_time}")
     print("=" * 60)
-    print(f"Space: {SNAPSHOT_SPACE}")
+    space_configs = parse_space_configs()
+    print(f"Space: {', '.join(space for space, _ in space_configs)}")
     print(f"Proposal max age: {PROPOSAL_MAX_AGE_DAYS} days")
     print(f"Alert threshold: {ALERT_THRESHOLD_DAYS} days")
     print(f"Show completed proposals: {'Yes' if SHOW_COMPLETED_PROPOSALS else 'No'}")
     print(f"Output: {OUTPUT_HTML}")
     print("=" * 60)
     
-    # Load council member wallets
-    print("\nLoading council member wallets...")
-    council_wallets, wallet_names = load_council_wallets()
-    print(f"Loaded {len(council_wallets)} council member addresses")
-    
-    # Fetch and analyze data
-    print("\nFetching active proposals from Snapshot...")
-    data = analyze_voting_status(council_wallets, wallet_names)
-    
-    print(f"\nFound {data['summary']['total_proposals']} active proposal(s)")
-    print(f"Generated {data['summary']['total_alerts']} alert(s)")
-    
-    # Generate HTML report
-    print(f"\nGenerating HTML report: {OUTPUT_HTML}")
-    html_content = generate_html_report(data, council_wallets)
+    if args.backfill:
+        print("\nLoading council member wallets...")
+        conn = open_archive_db()
+        try:
+            for space, council_wallets, _ in load_councils(space_configs):
+                print(f"\nArchiving {space}...")
+                count = sync_archive(conn, space, council_wallets)
+                print(f"✓ {count} proposal(s) archived in {ARCHIVE_DB}")
+        finally:
+            conn.close()
+        return
     
-    with open(OUTPUT_HTML, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    if args.deliver:
+        conn = open_state_db()
+        try:
+            print("\n📤 Delivering queued notifications...")
+            delivered = deliver_outbox(conn, force=True)
+            pending, _ = outbox_pending(conn)
+        finally:
+            conn.close()
+        print(f"✓ {delivered} notification(s) delivered, {pending} still queued")
+        return
     
-    print(f"✓ Report generated successfully!")
-    print(f"✓ Open {OUTPUT_HTML} in your browser to view the report")
+    # Deliver notifications in the background (including any left from earlier runs)
+    start_outbox_worker()
     
-    # Send Slack notifications
-    send_slack_notification(data, council_wallets)
+    if args.watch:
+        try:
+            watch(space_configs, args.interval)
+        except KeyboardInterrupt:
+            print("\n👋 Watch mode stopped")
+        return
     
-    # Print summary to console
-    if data['alerts']:
-        print("\n⚠️  ALERTS:")
-        for alert in data['alerts']:
-            print(f"  • {alert['wallet'][:10]}... hasn't voted on '{alert['proposal_title']}' ({alert['days_old']} days)")
-    else:
-        print("\n✓ No alerts - all council members are up to date!")
+    success = False
+    try:
+        # Load council member wallets
+        print("\nLoading council member wallets...")
+        with METRICS.stage("load_wallets"):
+            councils = load_councils(space_configs)
+        run_monitor(councils)
+        with METRICS.stage("deliver"):
+            finish_outbox()
+        success = True
+    finally:
+        write_metrics(success)
 
 
 if __name__ == "__main__":
     main()
-
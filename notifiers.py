@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Notification backends for the dashboards
+Each backend (Slack webhook, Telegram, local file, generic webhook) has its own
+HTTP session, rate limit, worker thread and timeout. Messages are sent to all
+backends concurrently, so one slow or unreachable channel cannot hold up the
+others or the pipeline that produced the messages.
+
+A message is a dict with:
+    label: short description for logs (e.g. the proposal title)
+    text: plain-text body
+    slack: optional Slack payload (Block Kit) used instead of ``text`` by Slack
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from http_utils import configure_rate_limit, request_with_retries
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+TELEGRAM_MAX_CHARS = 4096
+
+
+class NotifierError(Exception):
+    """A backend rejected a message or did not answer in time"""
+
+
+class Notifier:
+    """Base class for a notification backend
+
+    Messages submitted to a backend are sent one at a time on its own daemon
+    thread, so a backend that hangs only delays its own queue (and never keeps
+    the process from exiting). Each message has a deadline, which HTTP
+    backends enforce inside the request itself, retries included.
+    """
+
+    name = "notifier"
+    # True if send() stops by the message's deadline on its own
+    enforces_deadline = False
+
+    def __init__(self, timeout: float = 10.0, url: str = None, rate_limit: float = 0,
+                 max_retries: int = 3, backoff_base: float = 1.0):
+        self.timeout = timeout
+        self.url = url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.session = requests.Session()
+        if url and rate_limit:
+            configure_rate_limit(urlparse(url).netloc, rate_limit)
+        self._queue: "queue.Queue[Tuple[Future, Dict, float]]" = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        # Deadline of the message being sent (only touched by the worker thread)
+        self._deadline: Optional[float] = None
+
+    def send(self, message: Dict) -> None:
+        """Deliver one message (raises on failure)"""
+        raise NotImplementedError
+
+    def submit(self, message: Dict, deadline: float = None) -> Future:
+        """Queue a message on this backend's worker thread
+
+        Args:
+            message: Message to send
+            deadline: ``time.monotonic()`` time the message must be sent by
+                (defaults to the backend's timeout from now)
+        """
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"notify-{self.name}", daemon=True)
+                self._thread.start()
+        future = Future()
+        self._queue.put((future, message, deadline or time.monotonic() + self.timeout))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            future, message, deadline = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            if time.monotonic() >= deadline:
+                future.set_exception(NotifierError("timed out before it was sent"))
+                continue
+            self._deadline = deadline
+            try:
+                self.send(message)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+            finally:
+                self._deadline = None
+
+    def post_json(self, url: str, payload: Dict) -> requests.Response:
+        """POST JSON through the backend's session, rate limiter and retries,
+        finishing by the current message's deadline"""
+        return request_with_retries(
+            "POST",
+            url,
+            session=self.session,
+            max_retries=self.max_retries,
+            backoff_base=self.backoff_base,
+            deadline=self._deadline,
+            json=payload,
+            timeout=self.timeout
+        )
+
+
+class SlackWebhookNotifier(Notifier):
+    """Posts to a Slack incoming webhook"""
+
+    name = "slack"
+    enforces_deadline = True
+
+    def __init__(self, webhook_url: str, **options):
+        super().__init__(url=webhook_url, **options)
+
+    def send(self, message: Dict) -> None:
+        payload = message.get("slack") or {"text": message["text"], "unfurl_links": False, "unfurl_media": False}
+        response = self.post_json(self.url, payload)
+        if response.status_code != 200:
+            raise NotifierError(f"Slack returned status {response.status_code}: {response.text[:200]}")
+
+
+class TelegramNotifier(Notifier):
+    """Sends the plain-text body through a Telegram bot"""
+
+    name = "telegram"
+    enforces_deadline = True
+
+    def __init__(self, bot_token: str, chat_id: str, **options):
+        super().__init__(url=f"{TELEGRAM_API_URL}/bot{bot_token}/sendMessage", **options)
+        self.chat_id = chat_id
+
+    def send(self, message: Dict) -> None:
+        response = self.post_json(self.url, {
+            "chat_id": self.chat_id,
+            "text": message["text"][:TELEGRAM_MAX_CHARS],
+            "disable_web_page_preview": True
+        })
+        if response.status_code != 200:
+            raise NotifierError(f"Telegram returned status {response.status_code}: {response.text[:200]}")
+
+
+class WebhookNotifier(Notifier):
+    """POSTs ``{"label", "text"}`` as JSON to any HTTP endpoint (any 2xx is success)"""
+
+    name = "webhook"
+    enforces_deadline = True
+
+    def __init__(self, url: str, **options):
+        super().__init__(url=url, **options)
+
+    def send(self, message: Dict) -> None:
+        response = self.post_json(self.url, {"label": message.get("label", ""), "text": message["text"]})
+        if not 200 <= response.status_code < 300:
+            raise NotifierError(f"Webhook returned status {response.status_code}: {response.text[:200]}")
+
+
+class FileNotifier(Notifier):
+    """Appends messages to a local text file, rotated once it reaches ``max_bytes``
+    (keeping ``backups`` old copies: file.1, file.2, ...)"""
+
+    name = "file"
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024, backups: int = 3, **options):
+        super().__init__(**options)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def rotate(self, incoming: int) -> None:
+        """Rotate the file if ``incoming`` more bytes would take it past ``max_bytes``"""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            self.path.unlink()
+            return
+        for index in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+    def send(self, message: Dict) -> None:
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        entry = (
+            f"\n{'='*80}\n"
+            f"Timestamp: {timestamp}\n"
+            f"{'='*80}\n"
+            f"{message['text']}"
+            f"\n{'='*80}\n\n"
+        )
+        self.rotate(len(entry.encode('utf-8')))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(entry)
+
+
+class FunctionNotifier(Notifier):
+    """Runs a callable with the message (e.g. an optional notifier module's
+    entry point) on its own thread, under the same timeout as the others
+
+    The callable cannot be interrupted: a call still running at the deadline
+    is reported as timed out and left to finish on the worker thread.
+    """
+
+    def __init__(self, name: str, function: Callable[[Dict], None], **options):
+        super().__init__(**options)
+        self.name = name
+        self.function = function
+
+    def send(self, message: Dict) -> None:
+        self.function(message)
+
+
+# Backends that can be selected by name (e.g. from a NOTIFY_CHANNELS setting)
+NOTIFIER_TYPES = {
+    "slack": SlackWebhookNotifier,
+    "telegram": TelegramNotifier,
+    "webhook": WebhookNotifier,
+    "file": FileNotifier,
+}
+
+
+def create_notifier(kind: str, **options) -> Notifier:
+    """Create a registered backend by name"""
+    if kind not in NOTIFIER_TYPES:
+        raise ValueError(f"Unknown notifier '{kind}' (available: {', '.join(NOTIFIER_TYPES)})")
+    return NOTIFIER_TYPES[kind](**options)
+
+
+def dispatch(jobs: List[Tuple[Notifier, Dict]]) -> List[Tuple[Future, float, bool]]:
+    """Submit (backend, message) jobs without waiting for them
+
+    Returns:
+        list: (future, deadline, whether the backend enforces the deadline
+        itself) per job. Every message on a backend shares
+        that backend's deadline (its timeout from now), whatever the order of
+        the jobs, so a backlog on one backend does not eat into the time of
+        another; messages a backend has not got to by then are not sent.
+    """
+    started = time.monotonic()
+    dispatched = []
+    for notifier, message in jobs:
+        deadline = started + notifier.timeout
+        dispatched.append((notifier.submit(message, deadline), deadline, notifier.enforces_deadline))
+    return dispatched
+
+
+def collect(dispatched: List[Tuple[Future, float, bool]]) -> List[Optional[Exception]]:
+    """Wait for dispatched jobs up to their deadlines
+
+    A message still queued at its deadline is cancelled and reported as a
+    NotifierError, so it can safely be retried. A message already being sent
+    by a backend that enforces the deadline itself (the HTTP backends) is
+    waited for instead: the send stops at the same deadline, and only its
+    real outcome says whether it went out. Any other send still running is
+    reported as timed out and left running on its worker thread.
+
+    Returns:
+        list: None for each delivered message, otherwise the error
+    """
+    results = []
+    for future, deadline, enforces_deadline in dispatched:
+        try:
+            try:
+                future.result(timeout=max(deadline - time.monotonic(), 0))
+            except FutureTimeoutError:
+                if future.cancel():
+                    raise NotifierError("timed out before it was sent")
+                if not enforces_deadline:
+                    raise NotifierError("timed out")
+                future.result()
+        except Exception as e:
+            results.append(e)
+        else:
+            results.append(None)
+    return results
+
+
+def send_all(jobs: List[Tuple[Notifier, Dict]]) -> List[Optional[Exception]]:
+    """Send (backend, message) jobs concurrently and wait for the results"""
+    return collect(dispatch(jobs))
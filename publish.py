@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Atomic publishing for the generated dashboards
+Files are written to a temp file, fsynced and renamed into place, so the web
+server never serves a half-written page. Unchanged content is not rewritten
+(its mtime and ETag stay stable for browser and CDN caches), and precompressed
+.gz / .br siblings are produced for nginx gzip_static / brotli_static.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, TextIO, Tuple, Union
+
+# Brotli is optional; without it only the .gz sibling is written
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+SIDECAR_SUFFIX = ".meta.json"
+
+
+def sidecar_path(path: Union[str, Path]) -> Path:
+    """Return the metadata sidecar path for a published file"""
+    path = Path(path)
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def read_sidecar(path: Union[str, Path]) -> Dict:
+    """Load the metadata recorded when a file was last published ({} if none)"""
+    try:
+        with open(sidecar_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """Write bytes to ``path`` via a fsynced temp file in the same directory"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    fsync_directory(path.parent)
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush a rename to disk (best effort; not supported on every platform)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def is_published(path: Union[str, Path], fingerprint: str) -> bool:
+    """True if ``path`` exists and was published from the same fingerprint"""
+    return Path(path).exists() and read_sidecar(path).get("fingerprint") == fingerprint
+
+
+class PublishStream:
+    """Text sink that streams a file being published to a temp file next to
+    it, hashing it and feeding the .gz / .br compressors as it goes
+
+    The rendered content is never held in memory or read back. ``commit()``
+    renames the temp files into place; ``discard()`` removes them.
+    """
+
+    def __init__(self, path: Path, compress: bool = True):
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.path = path
+        self.compress = compress
+        self._temp_files: Dict[Path, Tuple[str, BinaryIO]] = {}
+        self._file = self._open_temp(path)
+        self._gzip = None
+        self._brotli = None
+        if compress:
+            # mtime=0 keeps the .gz byte-identical for identical content
+            self._gzip = gzip.GzipFile(filename="", mode='wb', compresslevel=9, mtime=0,
+                                       fileobj=self._open_temp(path.with_name(path.name + ".gz")))
+            if BROTLI_AVAILABLE:
+                self._brotli = brotli.Compressor()
+                self._brotli_file = self._open_temp(path.with_name(path.name + ".br"))
+
+    def _open_temp(self, target: Path) -> BinaryIO:
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        f = os.fdopen(fd, 'wb')
+        self._temp_files[target] = (tmp_name, f)
+        return f
+
+    @property
+    def digest(self) -> str:
+        return self.sha256.hexdigest()
+
+    def write(self, text: str) -> int:
+        self.write_bytes(text.encode('utf-8'))
+        return len(text)
+
+    def write_bytes(self, data: bytes) -> None:
+        self.sha256.update(data)
+        self.size += len(data)
+        self._file.write(data)
+        if self._gzip:
+            self._gzip.write(data)
+        if self._brotli:
+            self._brotli_file.write(self._brotli.process(data))
+
+    def commit(self) -> None:
+        """Fsync the temp files and rename them over the published ones"""
+        if self._gzip:
+            self._gzip.close()
+        if self._brotli:
+            self._brotli_file.write(self._brotli.finish())
+        for target, (tmp_name, f) in self._temp_files.items():
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, target)
+        self._temp_files = {}
+        if self.compress and not BROTLI_AVAILABLE:
+            # Never leave a stale .br next to fresh content
+            self.path.with_name(self.path.name + ".br").unlink(missing_ok=True)
+        fsync_directory(self.path.parent)
+
+    def discard(self) -> None:
+        """Remove the temp files, leaving the published ones untouched"""
+        if self._gzip:
+            self._gzip.close()
+        for tmp_name, f in self._temp_files.values():
+            f.close()
+            Path(tmp_name).unlink(missing_ok=True)
+        self._temp_files = {}
+
+
+def is_unchanged(path: Path, digest: str, fingerprint: str = None) -> bool:
+    """True if ``path`` was already published with this content
+
+    The sidecar's fingerprint is refreshed if only the inputs changed, so the
+    next run can skip rendering again.
+    """
+    previous = read_sidecar(path)
+    if not path.exists() or previous.get("sha256") != digest:
+        return False
+    if fingerprint is not None and previous.get("fingerprint") != fingerprint:
+        atomic_write_bytes(sidecar_path(path), json.dumps({**previous, "fingerprint": fingerprint}).encode('utf-8'))
+    return True
+
+
+def publish(path: Union[str, Path], content: Union[str, bytes, Callable[[TextIO], None]],
+            fingerprint: str = None, compress: bool = True) -> bool:
+    """Publish a generated file atomically, skipping it if nothing changed
+
+    Args:
+        path: Output file (e.g. index.html)
+        content: The file content, or a callable that renders text into the
+            file-like object it is given (streamed to a temp file, hashed
+            and compressed on the fly)
+        fingerprint: Optional hash of the inputs the content is generated
+            from. If it matches the published one, the file is left alone
+            without rendering it at all.
+        compress: Also write .gz (and .br if brotli is installed) siblings
+
+    Returns:
+        bool: True if the file was (re)written, False if it was unchanged
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fingerprint is not None and is_published(path, fingerprint):
+        return False
+
+    if not callable(content):
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        # In-memory content is checked before anything is written
+        if is_unchanged(path, hashlib.sha256(data).hexdigest(), fingerprint):
+            return False
+
+    stream = PublishStream(path, compress)
+    try:
+        if callable(content):
+            content(stream)
+        else:
+            stream.write_bytes(data)
+        if callable(content) and is_unchanged(path, stream.digest, fingerprint):
+            stream.discard()
+            return False
+        stream.commit()
+    except BaseException:
+        stream.discard()
+        raise
+
+    metadata = {
+        "sha256": stream.digest,
+        "etag": f'"{stream.digest[:32]}"',
+        "size": stream.size,
+        "fingerprint": fingerprint,
+        "published": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    }
+    atomic_write_bytes(sidecar_path(path), json.dumps(metadata, indent=2).encode('utf-8'))
+    return True
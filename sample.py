@@ -7,16 +7,25 @@ with sortable table and search functionality.
 """
 
 import os
+import re
 import json
+import hashlib
 import requests
 import shutil
 from datetime import datetime, timezone
 from typing import List, Tuple, Optional
 from dotenv import load_dotenv
+from publish import publish
+from notifiers import FunctionNotifier, collect, dispatch
+from assets import font_head_html, load_manifest, picture_html
 
 # Version of the dashboard generator
 VERSION = "0.0.9"
 
+# The "Last Update" timestamp changes on every run, so it is left out of the
+# fingerprint that decides whether index.html needs to be republished
+LAST_UPDATE_PATTERN = re.compile(r"Last Update: [^<]*")
+
 # Import telegram notifier (will be skipped if module not available)
 try:
     import telegram_notifier
@@ -1125,13 +1134,15 @@ def generate_html_dashboard(indexers: List[Tuple[str, str]], contract_address: s
     if quicknode_url:
         eligibility_period = get_eligibility_period(contract_address, quicknode_url)
     
+    asset_manifest = load_manifest()
+    
     html_content = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Eligibility Dashboard</title>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600&display=swap" rel="stylesheet">
+    {font_head_html(asset_manifest)}
     <style>
         * {{
             margin: 0;
@@ -1817,7 +1828,7 @@ def generate_html_dashboard(indexers: List[Tuple[str, str]], contract_address: s
     <div class="container">
         <div class="header">
             <div class="title-container">
-                <img src="grt.png" alt="GRT" class="header-icon">
+                {picture_html(asset_manifest, "grt.png", "GRT", "50px", class_="header-icon")}
                 <h1>Eligibility Dashboard</h1>
             </div>
             <div class="subtitle">Last Update: {current_time}</div>
@@ -2390,27 +2401,34 @@ def main():
     logStatusChanges()
     print()
     
-    # Send Telegram notifications about oracle update and status changes
+    # Send Telegram notifications about oracle update and status changes in
+    # the background while the dashboard is generated
+    notifications = []
     if TELEGRAM_AVAILABLE:
-        try:
-            print("Sending Telegram notifications...")
-            telegram_notifier.send_notifications()
-            print()
-        except Exception as e:
-            print(f"⚠ Warning: Could not send Telegram notifications: {e}")
-            print()
+        print("Sending Telegram notifications in the background...")
+        print()
+        telegram = FunctionNotifier("telegram", lambda message: telegram_notifier.send_notifications(),
+                                    timeout=float(os.getenv("TELEGRAM_TIMEOUT", "60")))
+        notifications = dispatch([(telegram, {"label": "oracle update", "text": ""})])
     else:
         print("ℹ️ Telegram notifications disabled (module not available)")
         print()
     
     html_content = generate_html_dashboard(indexers, contract_address=contract_address, api_key=api_key, quicknode_url=quicknode_url)
     
-    # Write to index.html
-    with open('index.html', 'w', encoding='utf-8') as file:
-        file.write(html_content)
-    
-    print("Dashboard generated successfully!")
+    # Publish index.html atomically (left untouched if only the timestamp changed)
+    fingerprint = hashlib.sha256(LAST_UPDATE_PATTERN.sub("", html_content).encode('utf-8')).hexdigest()
+    if publish('index.html', html_content, fingerprint=fingerprint):
+        print("Dashboard generated successfully!")
+    else:
+        print("Dashboard unchanged since the last run - index.html left untouched")
     print("Open 'index.html' in your browser to view the dashboard.")
+    
+    for error in collect(notifications):
+        if error:
+            print(f"⚠ Warning: Could not send Telegram notifications: {error}")
+        else:
+            print("✓ Telegram notifications sent")
 
 
 if __name__ == "__main__":
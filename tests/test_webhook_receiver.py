@@ -0,0 +1,113 @@
+"""Webhook receiver tests against a fake Snapshot hub (no network access)"""
+
+import re
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import monitor_council_votes as monitor
+import webhook_receiver
+
+SPACE = "council.graphprotocol.eth"
+ALICE = "0x7eabe4f636b937628a7fe503bd7f06772c047fee"
+BOB = "0x68afabc57e048b29e0741816167777c148a02b57"
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self._data = data
+        self.content = b"{}"
+
+    def json(self):
+        return {"data": self._data}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeHub:
+    """Answers the monitor's GraphQL queries from in-memory proposals and votes"""
+
+    def __init__(self):
+        now = int(time.time())
+        self.proposal = {
+            "id": "0xp1", "title": "GGP-0001 Test proposal", "start": now - 6 * 86400,
+            "end": now + 86400, "state": "active", "created": now - 6 * 86400, "votes": 1,
+            "author": "0xauthor", "choices": ["For", "Against"], "scores": [1.0, 0.0],
+            "scores_total": 1.0, "space": {"id": SPACE}
+        }
+        self.votes = [{"id": "v1", "voter": ALICE, "choice": 1, "created": now - 86400, "vp": 1.0}]
+
+    def votes_where(self, voters, created_gte):
+        voters = {voter.lower() for voter in voters or ()}
+        return [vote for vote in self.votes
+                if vote["created"] >= created_gte and (not voters or vote["voter"].lower() in voters)]
+
+    def request(self, method, url, json=None, **kwargs):
+        query, variables = json["query"], json.get("variables") or {}
+        if "proposals(" in query:
+            data = {"proposals": [self.proposal]}
+        elif "proposal(id" in query:
+            data = {"proposal": self.proposal if variables["id"] == self.proposal["id"] else None}
+        elif "BatchedVotes" in query:
+            data = {
+                alias: self.votes_where(variables.get("voters"), variables[f"c{alias[1:]}"])
+                for alias in re.findall(r"(p\d+): votes\(", query)
+            }
+        else:
+            votes = self.votes_where(variables.get("voters"), variables.get("created", 0))
+            data = {"votes": votes[variables.get("skip", 0):]}
+        return FakeResponse(data)
+
+
+class ApplyEventTest(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.hub = FakeHub()
+        patches = [
+            mock.patch.object(monitor, "request_with_retries", self.hub.request),
+            mock.patch.object(monitor, "SNAPSHOT_CACHE_DIR", f"{workdir.name}/cache"),
+            mock.patch.object(monitor, "SNAPSHOT_CACHE_TTL", 60),
+            mock.patch.object(monitor, "SNAPSHOT_CACHE_BYPASS", False),
+            mock.patch.object(monitor, "STATE_DB", f"{workdir.name}/state.db"),
+            mock.patch.object(monitor, "CLOSED_PROPOSALS_DIR", f"{workdir.name}/closed"),
+            mock.patch.object(monitor, "REPORT_JSON", False),
+            mock.patch.object(monitor, "write_html_reports", mock.Mock()),
+            mock.patch.object(monitor, "send_slack_notification", mock.Mock()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.state = webhook_receiver.ReportState([(SPACE, [ALICE, BOB], {})])
+
+    def non_voters(self):
+        proposal, = self.state.reports[SPACE]["proposals"]
+        return proposal["council_non_voters"]
+
+    def test_vote_created_right_after_refresh_skips_cache(self):
+        self.state.refresh_all()
+        self.assertEqual(self.non_voters(), [BOB])
+
+        self.hub.votes.append({"id": "v2", "voter": BOB, "choice": 2, "created": int(time.time()), "vp": 1.0})
+        self.state.apply_event(SPACE, "0xp1", "vote/created")
+
+        self.assertEqual(self.non_voters(), [])
+        monitor.send_slack_notification.assert_not_called()
+
+    def test_vote_created_updates_running_tally(self):
+        with mock.patch.object(monitor, "SHOW_VOTE_TALLIES", True):
+            self.state.refresh_all()
+            self.hub.votes.append({"id": "v2", "voter": BOB, "choice": 2, "created": int(time.time()), "vp": 3.0})
+            self.state.apply_event(SPACE, "0xp1", "vote/created")
+
+        proposal, = self.state.reports[SPACE]["proposals"]
+        self.assertEqual([(row["vp"], row["votes"]) for row in proposal["tally"]], [(1.0, 1), (3.0, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Snapshot Webhook Receiver
+Receives Snapshot webhook events and refreshes the council report for the
+affected proposal only, instead of waiting for the next scheduled poll
+"""
+
+import os
+import sys
+import json
+import queue
+import argparse
+import asyncio
+import threading
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import monitor_council_votes as monitor
+
+# Configuration
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8787"))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_MAX_BODY_BYTES = 16 * 1024
+
+SUPPORTED_EVENTS = {
+    "proposal/created",
+    "proposal/start",
+    "proposal/end",
+    "proposal/deleted",
+    "vote/created",
+}
+
+
+def validate_event(payload, monitored_spaces: List[str]) -> str:
+    """Check that a webhook payload is an event we can act on
+
+    Returns:
+        str: an error message, or an empty string if the event is valid
+    """
+    if not isinstance(payload, dict):
+        return "payload must be a JSON object"
+    event = payload.get("event")
+    if event not in SUPPORTED_EVENTS:
+        return f"unsupported event: {event!r}"
+    if payload.get("space") not in monitored_spaces:
+        return f"space is not monitored: {payload.get('space')!r}"
+    event_id = payload.get("id")
+    if not isinstance(event_id, str) or not event_id.startswith("proposal/") or len(event_id) <= len("proposal/"):
+        return f"invalid proposal id: {event_id!r}"
+    return ""
+
+
+class ReportState:
+    """In-memory council reports, updated one proposal at a time"""
+
+    def __init__(self, councils: List[tuple]):
+        self.councils = {space: (wallets, names) for space, wallets, names in councils}
+        self.reports: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def council_wallets(self) -> List[str]:
+        wallets = []
+        for space_wallets, _ in self.councils.values():
+            wallets.extend(w for w in space_wallets if w not in wallets)
+        return wallets
+
+    def refresh_all(self) -> None:
+        """Run a full analysis of every space (used once at startup)"""
+        councils = [(space, wallets, names) for space, (wallets, names) in self.councils.items()]
+        reports = asyncio.run(monitor.analyze_spaces_async(councils))
+        with self.lock:
+            self.reports = {report["space"]: report for report in reports}
+        monitor.write_html_reports(list(self.reports.values()), self.council_wallets)
+        if monitor.REPORT_JSON:
+            monitor.write_report_json(monitor.merge_space_reports(list(self.reports.values())))
+
+    def update_tally(self, proposal: Dict) -> List[Dict]:
+        """Fold the votes cast since the tally watermark into the proposal's running tally"""
+        state_db = monitor.open_state_db()
+        try:
+            watermark = monitor.load_tally_watermark(state_db, proposal["id"])
+            votes = monitor.fetch_new_tally_votes(proposal["id"], *watermark, use_cache=False)
+            monitor.apply_tally_votes(state_db, proposal, votes, watermark)
+            state_db.commit()
+            return monitor.load_vote_tally(state_db, proposal)
+        finally:
+            state_db.close()
+
+    def apply_event(self, space: str, proposal_id: str, event: str) -> None:
+        """Re-check a single proposal and publish the updated report
+
+        Only this proposal is fetched from Snapshot, and Slack alerts are only
+        sent for this proposal. The fetch skips the Snapshot disk cache, since
+        the event means any cached copy is out of date.
+        """
+        wallets, _ = self.councils[space]
+        result = None
+
+        if event not in ("proposal/end", "proposal/deleted"):
+            proposal = monitor.fetch_proposal(proposal_id, use_cache=False)
+            if proposal and proposal.get("state") == "active" and \
+                    monitor.calculate_days_since(proposal["created"]) <= monitor.PROPOSAL_MAX_AGE_DAYS:
+                votes = monitor.fetch_votes_for_proposals([proposal_id], voters=wallets, use_cache=False)[proposal_id]
+                voters = {vote["voter"].lower() for vote in votes}
+                tally = self.update_tally(proposal) if monitor.SHOW_VOTE_TALLIES else None
+                result = monitor.build_proposal_result(proposal, voters, wallets, space, tally=tally)
+
+        with self.lock:
+            report = self.reports[space]
+            proposals = [p for p in report["proposals"] if p["id"] != proposal_id]
+            if result:
+                proposals.append(result)
+                proposals.sort(key=lambda p: p["created"], reverse=True)
+            report["proposals"] = proposals
+            report["participation"] = {space: monitor.build_participation(wallets, proposals)}
+            report["alerts"] = [alert for p in proposals for alert in p["alerts"]]
+            report["summary"] = {
+                "total_proposals": len(proposals),
+                "total_alerts": len(report["alerts"])
+            }
+            reports = list(self.reports.values())
+
+        action = "updated" if result else "removed"
+        print(f"✓ {event}: {proposal_id[:12]}... {action} in {space}")
+        monitor.write_html_reports(reports, self.council_wallets)
+        if monitor.REPORT_JSON:
+            monitor.write_report_json(monitor.merge_space_reports(reports))
+
+        if result and result["alerts"]:
+            monitor.send_slack_notification({**report, "proposals": [result]}, wallets)
+
+
+def process_events(state: ReportState, events: "queue.Queue") -> None:
+    """Worker loop: apply queued events, coalescing bursts for the same proposal"""
+    while True:
+        batch = [events.get()]
+        while not events.empty():
+            batch.append(events.get_nowait())
+
+        latest = {}
+        for payload in batch:
+            proposal_id = payload["id"].split("/", 1)[1]
+            latest[(payload["space"], proposal_id)] = payload["event"]
+
+        for (space, proposal_id), event in latest.items():
+            try:
+                state.apply_event(space, proposal_id, event)
+            except Exception as e:
+                print(f"✗ Failed to process {event} for {proposal_id}: {e}")
+
+
+def make_handler(events: "queue.Queue", monitored_spaces: List[str]):
+    """Build the request handler class bound to the event queue"""
+
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if WEBHOOK_SECRET and self.headers.get("Authentication", "") != WEBHOOK_SECRET:
+                self._reply(401, "invalid secret")
+                return
+
+            length = int(self.headers.get("Content-Length") or 0)
+            if length <= 0 or length > WEBHOOK_MAX_BODY_BYTES:
+                self._reply(413 if length > 0 else 400, "invalid body size")
+                return
+
+            try:
+                payload = json.loads(self.rfile.read(length))
+            except ValueError:
+                self._reply(400, "invalid JSON")
+                return
+
+            error = validate_event(payload, monitored_spaces)
+            if error:
+                self._reply(400, error)
+                return
+
+            # Acknowledge right away; the report is refreshed in the background
+            events.put(payload)
+            self._reply(202, "accepted")
+
+        def _reply(self, status: int, message: str) -> None:
+            body = json.dumps({"status": message}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            print(f"[webhook] {self.address_string()} - {format % args}")
+
+    return WebhookHandler
+
+
+def serve(host: str, port: int) -> None:
+    """Load the councils, build the initial report and start receiving events"""
+    space_configs = monitor.parse_space_configs()
+    print("Loading council member wallets...")
+    state = ReportState(monitor.load_councils(space_configs))
+
+    print("Building initial report...")
+    state.refresh_all()
+
+    events = queue.Queue()
+    threading.Thread(target=process_events, args=(state, events), daemon=True).start()
+    monitor.start_outbox_worker()
+
+    monitored_spaces = [space for space, _ in space_configs]
+    server = ThreadingHTTPServer((host, port), make_handler(events, monitored_spaces))
+    print(f"\n📡 Listening for Snapshot webhooks on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Webhook receiver stopped")
+    finally:
+        server.server_close()
+
+
+def replay(samples_file: str, url: str) -> None:
+    """Local stand-in for Snapshot: POST sample webhook payloads to a receiver"""
+    with open(samples_file, 'r', encoding='utf-8') as f:
+        samples = json.load(f)
+
+    headers = {"Content-Type": "application/json"}
+    if WEBHOOK_SECRET:
+        headers["Authentication"] = WEBHOOK_SECRET
+
+    for payload in samples:
+        try:
+            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            print(f"  {payload.get('event')} {payload.get('id')} -> {response.status_code} {response.text}")
+        except requests.exceptions.RequestException as e:
+            print(f"  ✗ {payload.get('event')} {payload.get('id')}: {e}")
+            sys.exit(1)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Snapshot webhook receiver for the council monitor")
+    parser.add_argument("--host", default=WEBHOOK_HOST, help=f"address to listen on (default: {WEBHOOK_HOST})")
+    parser.add_argument("--port", type=int, default=WEBHOOK_PORT, help=f"port to listen on (default: {WEBHOOK_PORT})")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="instead of serving, POST the sample payloads in FILE to a running receiver")
+    parser.add_argument("--url", help="receiver URL for --replay (default: http://HOST:PORT/)")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay(args.replay, args.url or f"http://{args.host}:{args.port}/")
+    else:
+        serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()